@@ -0,0 +1,66 @@
+"""Benchmark: pg.sprite.groupcollide gegen SpatialHash (Zombies gegen Projektile)
+
+Aufruf aus dem Projektverzeichnis:
+    python -m benchmarks.collision
+"""
+import random
+import timeit
+import pygame as pg
+from settings import *
+from world.spatial_hash import SpatialHash, groupcollide
+
+
+# Getestete Kombinationen (Zombies, Projektile)
+SIZES = [(5, 2), (10, 5), (20, 10), (50, 20), (100, 50), (200, 100), (500, 200), (1000, 500)]
+REPEATS = 20
+
+
+def make_group(count, size, rng):
+    """Erstellt eine Gruppe mit zufällig verteilten Sprites"""
+    group = pg.sprite.Group()
+    for _ in range(count):
+        sprite = pg.sprite.Sprite(group)
+        sprite.rect = pg.Rect(rng.randrange(SCREEN_WIDTH), rng.randrange(SCREEN_HEIGHT), size, size)
+    return group
+
+
+def bench(zombie_count, bullet_count, seed=0):
+    """Misst beide Varianten und prüft, dass sie dieselben Treffer liefern"""
+    rng = random.Random(seed)
+    zombies = make_group(zombie_count, ZOMBIE_NORMAL_SIZE, rng)
+    bullets = make_group(bullet_count, BULLET_SIZE, rng)
+    spatial_hash = SpatialHash()
+
+    def brute_force():
+        return pg.sprite.groupcollide(zombies, bullets, False, False)
+
+    def hashed():
+        spatial_hash.rebuild(bullets)
+        return groupcollide(zombies, spatial_hash, False, False)
+
+    if brute_force() != hashed():
+        raise AssertionError(f"Unterschiedliche Treffer bei {zombie_count}x{bullet_count}")
+
+    t_brute = min(timeit.repeat(brute_force, number=REPEATS, repeat=3)) / REPEATS
+    t_hash = min(timeit.repeat(hashed, number=REPEATS, repeat=3)) / REPEATS
+    return t_brute, t_hash
+
+
+def main():
+    crossover = None
+    print(f"{'zombies':>8} {'bullets':>8} {'groupcollide ms':>16} {'spatial hash ms':>16} {'speedup':>8}")
+    for zombie_count, bullet_count in SIZES:
+        t_brute, t_hash = bench(zombie_count, bullet_count)
+        speedup = t_brute / t_hash
+        if crossover is None and speedup > 1:
+            crossover = (zombie_count, bullet_count)
+        print(f"{zombie_count:>8} {bullet_count:>8} {t_brute * 1000:>16.4f} {t_hash * 1000:>16.4f} {speedup:>7.2f}x")
+
+    if crossover:
+        print(f"Crossover: Spatial Hash ist ab {crossover[0]} Zombies / {crossover[1]} Projektilen schneller")
+    else:
+        print("Crossover: groupcollide war in allen Messungen schneller")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Micro-Benchmark: PathFinder.find_path auf zufälligen Karten aus Map.generate_map
+
+Aufruf aus dem Projektverzeichnis:
+    python -m benchmarks.pathfinding
+"""
+import random
+import types
+import timeit
+from settings import *
+from world.map import Map
+from world.pathfinding import PathFinder
+
+
+MAPS = 20  # Anzahl zufälliger Karten
+QUERIES = 50  # Suchanfragen pro Karte
+
+
+def make_map(seed):
+    """Erzeugt eine zufällige Karte und einen PathFinder dafür (ohne Cache, gemessen wird die Suche)"""
+    game = types.SimpleNamespace(rng=random.Random(seed))
+    game.map = Map(game)
+    return game.map, PathFinder(game, cache_size=0)
+
+
+def open_positions(game_map):
+    """Pixel-Mittelpunkte aller freien Tiles"""
+    return [(x * TILESIZE + TILESIZE // 2, y * TILESIZE + TILESIZE // 2)
+            for y in range(game_map.height) for x in range(game_map.width)
+            if game_map.map_data[y][x] == 0]
+
+
+def main():
+    times = []
+    found = 0
+    for seed in range(MAPS):
+        game_map, pathfinder = make_map(seed)
+        positions = open_positions(game_map)
+        rng = random.Random(seed)
+        queries = [(rng.choice(positions), rng.choice(positions)) for _ in range(QUERIES)]
+
+        for start, end in queries:
+            if pathfinder.find_path(start, end):
+                found += 1
+            times.append(min(timeit.repeat(lambda: pathfinder.find_path(start, end), number=5, repeat=3)) / 5)
+
+    times.sort()
+    total = len(times)
+    print(f"Karten: {MAPS}, Anfragen: {total}, Pfade gefunden: {found}")
+    print(f"Mittelwert: {sum(times) / total * 1000:.4f} ms")
+    print(f"p50: {times[total // 2] * 1000:.4f} ms")
+    print(f"p95: {times[int(total * 0.95)] * 1000:.4f} ms")
+    print(f"max: {times[-1] * 1000:.4f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""Benchmark-Suite für die Hot Paths des Spiels (headless mit SDL-Dummy-Treiber)
+
+Misst den echten Spielcode: PathFinder.find_path, Map.draw, Game.update mit
+N Zombies und M Projektilen, die Kollisionsphasen (groupcollide gegen
+Spatial Hash) und das Spawnen einer Welle. Die Ergebnisse werden als JSON
+geschrieben und optional mit einer gespeicherten Baseline verglichen (Minimum
+der Messungen); bei
+einer Verschlechterung über der Toleranz endet der Aufruf mit Exit-Code 1.
+
+Die Baseline gilt nur für den Rechner, auf dem sie gespeichert wurde.
+
+Aufruf aus dem Projektverzeichnis:
+    python -m benchmarks.suite --save-baseline           # Baseline speichern
+    python -m benchmarks.suite --compare                 # gegen Baseline prüfen
+    python -m benchmarks.suite --output results.json --quick
+"""
+import os
+
+# Vor dem ersten Import von pygame: kein Fenster, kein Audiogerät, kein Begrüßungstext auf stdout
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import time
+import pygame as pg
+from settings import *
+from main import Game
+from sprites.zombie import NormalZombie, FastZombie, StrongZombie
+from world.spatial_hash import SpatialHash, groupcollide
+from benchmarks.pathfinding import make_map, open_positions
+
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+TOLERANCE = 0.15  # Erlaubte Verschlechterung gegenüber der Baseline
+COMPARE_KEY = 'min_ms'  # Verglichen wird das Minimum, es schwankt am wenigsten mit der Systemlast
+
+UPDATE_SIZES = [(50, 20), (200, 100), (500, 200)]  # (Zombies, Projektile) für Game.update
+COLLISION_SIZES = [(50, 20), (200, 100), (1000, 500)]  # (Zombies, Projektile) für groupcollide
+WAVES = [1, 10, 30]  # Gestartete Welle für das Spawnen der Warteschlange
+
+
+def measure(setup, run, repeat, number=1):
+    """Führt setup() und danach number-mal run() aus; gibt die Zeiten pro Aufruf in ms zurück.
+
+    Wie bei timeit ist die Garbage Collection während der Messung aus.
+    """
+    times = []
+    for _ in range(repeat):
+        state = setup()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            for _ in range(number):
+                run(state)
+            times.append((time.perf_counter() - start) * 1000 / number)
+        finally:
+            gc.enable()
+    return times
+
+
+def stats(times):
+    """Kennzahlen einer Messreihe in ms"""
+    times = sorted(times)
+    return {
+        'median_ms': times[len(times) // 2],
+        'min_ms': times[0],
+        'p95_ms': times[min(int(len(times) * 0.95), len(times) - 1)],
+        'runs': len(times),
+    }
+
+
+def make_game(seed=0):
+    """Erzeugt ein headless Spiel mit fester Karte, ohne die Spielschleife zu starten"""
+    game = Game(headless=True, seed=seed)
+    game.setup()
+    game.dt = 1 / FPS
+    game.player.health = game.player.max_health = float('inf')  # Spieler stirbt nicht
+    return game
+
+
+def clear_zombies(game):
+    """Entfernt alle Zombies der aktuellen Welle, auch die noch nicht gespawnten"""
+    game.wave_manager.spawn_queue.clear()
+    for zombie in list(game.zombies):
+        zombie.kill()
+
+
+def clear_bullets(game):
+    """Entfernt alle Projektile"""
+    for bullet in list(game.bullets):
+        bullet.kill()
+    if game.bullet_system:
+        game.bullet_system.clear()
+
+
+def populate(game, zombie_count, bullet_count, seed=0):
+    """Verteilt Zombies und Projektile zufällig auf freie Tiles"""
+    rng = random.Random(seed)
+    positions = open_positions(game.map)
+    clear_zombies(game)
+    clear_bullets(game)
+    for index in range(zombie_count):
+        zombie_class = (NormalZombie, FastZombie, StrongZombie)[index % 3]
+        zombie = zombie_class(game, *rng.choice(positions))
+        if game.zombie_swarm:
+            game.zombie_swarm.add(zombie)
+    for _ in range(bullet_count):
+        direction = pg.math.Vector2(1, 0).rotate(rng.uniform(0, 360))
+        x, y = rng.choice(positions)
+        if game.bullet_system:
+            game.bullet_system.spawn(x, y, direction.x, direction.y)
+        else:
+            game.bullet_pool.acquire(x, y, direction.x, direction.y)
+
+
+def bench_find_path(quick):
+    """PathFinder.find_path ohne Cache-Treffer auf zufälligen Karten (Zeit pro Anfrage)"""
+    maps = 3 if quick else 10
+    queries = []
+    for seed in range(maps):
+        game_map, pathfinder = make_map(seed)
+        positions = open_positions(game_map)
+        rng = random.Random(seed)
+        queries.extend((pathfinder, rng.choice(positions), rng.choice(positions)) for _ in range(20))
+
+    def run(state):
+        for pathfinder, start, end in queries:
+            pathfinder.cache.clear()
+            pathfinder.find_path(start, end)
+
+    times = measure(lambda: None, run, repeat=5 if quick else 15)
+    return {'find_path': stats([t / len(queries) for t in times])}
+
+
+def bench_map_draw(quick):
+    """Map.draw (gecachter Hintergrund) und das Neu-Rendern des Hintergrunds"""
+    game = make_game()
+    repeat = 20 if quick else 100
+    draw = measure(lambda: None, lambda state: game.map.draw(game.screen), repeat, number=10)
+    render = measure(lambda: None, lambda state: game.map.render_background(), repeat)
+    return {'map_draw': stats(draw), 'map_render_background': stats(render)}
+
+
+def bench_game_update(quick):
+    """Game.update über 30 Ticks mit N Zombies und M Projektilen"""
+    results = {}
+    for zombie_count, bullet_count in UPDATE_SIZES[:2] if quick else UPDATE_SIZES:
+        def setup():
+            game = make_game()
+            populate(game, zombie_count, bullet_count)
+            return game
+
+        times = measure(setup, lambda game: game.update(), repeat=5 if quick else 11, number=30)
+        results[f'game_update_{zombie_count}z_{bullet_count}b'] = stats(times)
+    return results
+
+
+def bench_collision(quick):
+    """Kollisionsphase Zombies gegen Projektile: pg.sprite.groupcollide und Spatial Hash"""
+    results = {}
+    game = make_game()
+    for zombie_count, bullet_count in COLLISION_SIZES[:2] if quick else COLLISION_SIZES:
+        populate(game, zombie_count, bullet_count)
+        spatial_hash = SpatialHash()
+        repeat = 10 if quick else 30
+
+        def brute_force(state):
+            pg.sprite.groupcollide(game.zombies, game.bullets, False, False)
+
+        def hashed(state):
+            spatial_hash.rebuild(game.bullets)
+            groupcollide(game.zombies, spatial_hash, False, False)
+
+        size = f'{zombie_count}z_{bullet_count}b'
+        results[f'groupcollide_{size}'] = stats(measure(lambda: None, brute_force, repeat, number=5))
+        results[f'spatial_hash_{size}'] = stats(measure(lambda: None, hashed, repeat, number=5))
+    return results
+
+
+def bench_wave_spawn(quick):
+    """Spawnen einer kompletten Welle aus der Warteschlange für frühe und späte Wellen.
+
+    start_next_wave stellt die Zombies nur in die Warteschlange (nicht gemessen);
+    gemessen wird das Spawnen aller eingereihten Zombies mit spawn_random_zombie.
+    """
+    results = {}
+    game = make_game()
+    wave_manager = game.wave_manager
+    for wave in WAVES:
+        def setup():
+            clear_zombies(game)
+            wave_manager.current_wave = wave - 1
+            wave_manager.start_next_wave()
+
+        def spawn_all(state):
+            while wave_manager.spawn_queue:
+                wave_manager.spawn_random_zombie(wave_manager.spawn_queue.pop())
+
+        times = measure(setup, spawn_all, repeat=5 if quick else 20)
+        results[f'wave_spawn_{wave}'] = stats(times)
+    clear_zombies(game)
+    return results
+
+
+BENCHMARKS = [bench_find_path, bench_map_draw, bench_game_update, bench_collision, bench_wave_spawn]
+
+
+def run_all(quick=False, only=None):
+    """Führt alle (oder die per Namensteil ausgewählten) Benchmarks aus"""
+    results = {}
+    for bench in BENCHMARKS:
+        if only and only not in bench.__name__:
+            continue
+        results.update(bench(quick))
+    return results
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """Vergleicht mit der Baseline (COMPARE_KEY); gibt die Namen der Verschlechterungen zurück"""
+    regressions = []
+    print(f"{'benchmark':<32} {'baseline ms':>12} {'aktuell ms':>12} {'faktor':>8}")
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            print(f"{name:<32} {'-':>12} {current[COMPARE_KEY]:>12.4f} {'neu':>8}")
+            continue
+        ratio = current[COMPARE_KEY] / previous[COMPARE_KEY] if previous[COMPARE_KEY] else 1.0
+        marker = ''
+        if ratio > 1 + tolerance:
+            regressions.append(name)
+            marker = '  REGRESSION'
+        print(f"{name:<32} {previous[COMPARE_KEY]:>12.4f} {current[COMPARE_KEY]:>12.4f} {ratio:>7.2f}x{marker}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark-Suite für die Hot Paths des Spiels")
+    parser.add_argument('--quick', action='store_true', help="Weniger Größen und Wiederholungen")
+    parser.add_argument('--only', help="Nur Benchmarks, deren Name diesen Teil enthält (z.B. collision)")
+    parser.add_argument('--output', help="Ergebnisse als JSON schreiben")
+    parser.add_argument('--baseline', default=BASELINE_FILE, help="Pfad der Baseline-Datei")
+    parser.add_argument('--save-baseline', action='store_true', help="Ergebnisse als neue Baseline speichern")
+    parser.add_argument('--compare', action='store_true', help="Mit der Baseline vergleichen")
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE)
+    args = parser.parse_args()
+
+    # Ohne Baseline nicht erst alle Benchmarks laufen lassen
+    if args.compare and not args.save_baseline and not os.path.exists(args.baseline):
+        parser.error(f"keine Baseline unter {args.baseline}, zuerst mit --save-baseline speichern")
+
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'pygame': pg.version.ver,
+            'platform': platform.platform(),
+            'quick': args.quick,
+        },
+        'results': run_all(args.quick, args.only),
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline gespeichert: {args.baseline}")
+
+    if args.compare:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(report['results'], baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} Verschlechterung(en) über {args.tolerance:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+    elif not args.output and not args.save_baseline:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
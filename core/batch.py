@@ -0,0 +1,160 @@
+"""Batch-Simulator: viele Headless-Spiele parallel für Balance-Sweeps
+
+Jeder Lauf startet ein Headless-Spiel mit KI-Spieler und eigenem Seed. Werte
+aus settings.py lassen sich pro Lauf überschreiben; für jede Kombination der
+angegebenen Werte und jeden Seed entsteht ein Lauf. Die Läufe werden auf einen
+Prozess-Pool verteilt, die Ergebnisse als CSV und/oder JSON geschrieben.
+
+Aufruf aus dem Projektverzeichnis:
+    python -m core.batch --set WAVE_ZOMBIE_INCREMENT=2,3,4 --seeds 20 --csv results.csv
+"""
+import argparse
+import ast
+import csv
+import itertools
+import json
+import os
+import sys
+from collections import ChainMap
+from concurrent.futures import ProcessPoolExecutor
+
+import settings
+from settings import FPS
+
+
+# Standardwerte der Einstellungen, bevor ein Lauf sie überschreibt
+DEFAULTS = {}
+
+RESULT_FIELDS = ['seed', 'wave_reached', 'time_alive', 'damage_taken', 'ticks', 'game_over']
+
+
+def game_modules():
+    """Alle geladenen Module des Spiels (Dateien im Projektverzeichnis)"""
+    root = os.path.dirname(os.path.abspath(settings.__file__))
+    for module in list(sys.modules.values()):
+        filename = getattr(module, '__file__', None)
+        if filename and os.path.abspath(filename).startswith(root + os.sep):
+            yield module
+
+
+def apply_settings(overrides):
+    """Setzt Einstellungen für einen Lauf in allen Spielmodulen.
+
+    Wegen `from settings import *` hat jedes Modul eine eigene Kopie der
+    Konstanten, deshalb werden alle Spielmodule mit dem Namen gepatcht.
+    Werte früherer Läufe im selben Prozess werden vorher zurückgesetzt.
+    Abgeleitete Einstellungen (settings.DERIVED_SETTINGS, z.B.
+    BULLET_SPEED_PER_SECOND aus BULLET_SPEED) werden nur neu berechnet, wenn
+    eine ihrer Eingaben überschrieben wird; sonst gilt der Wert aus settings.py.
+    """
+    for name in overrides:
+        if not hasattr(settings, name):
+            raise KeyError(f"Unbekannte Einstellung: {name}")
+
+    # Überschriebene Eingaben ziehen ihre abgeleiteten Einstellungen nach (in Tabellenreihenfolge)
+    values = dict(overrides)
+    lookup = ChainMap(values, DEFAULTS, vars(settings))
+    for name, (inputs, formula) in settings.DERIVED_SETTINGS.items():
+        if name not in overrides and any(key in values for key in inputs):
+            values[name] = formula(*(lookup[key] for key in inputs))
+
+    for name in values:
+        DEFAULTS.setdefault(name, getattr(settings, name))
+    values = dict(DEFAULTS, **values)
+    for module in game_modules():
+        for name, value in values.items():
+            if name in module.__dict__:
+                setattr(module, name, value)
+
+
+def run_simulation(overrides, seed, max_ticks, max_waves):
+    """Führt einen Headless-Lauf aus und gibt seine Kennzahlen zurück"""
+    import main
+    apply_settings(overrides)
+
+    game = main.Game(headless=True, max_ticks=max_ticks, max_waves=max_waves, seed=seed)
+    game.new()
+
+    result = dict(overrides)
+    result.update({
+        'seed': seed,
+        'wave_reached': game.wave_manager.current_wave,
+        'time_alive': round(game.clock.get_ticks() / 1000, 3),
+        'damage_taken': game.player.damage_taken,
+        'ticks': game.ticks,
+        'game_over': game.game_over,
+    })
+    return result
+
+
+def parse_sweep(assignments):
+    """Wandelt ['NAME=1,2', ...] in eine Liste aller Kombinationen um"""
+    names, choices = [], []
+    for assignment in assignments:
+        name, _, values = assignment.partition('=')
+        names.append(name.strip())
+        choices.append([ast.literal_eval(value.strip()) for value in values.split(',')])
+    return [dict(zip(names, combination)) for combination in itertools.product(*choices)]
+
+
+def run_batch(sweep, seeds, max_ticks, max_waves, workers=None):
+    """Verteilt alle Läufe (Kombination x Seed) auf einen Prozess-Pool"""
+    jobs = [(overrides, seed) for overrides in sweep for seed in seeds]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_simulation, overrides, seed, max_ticks, max_waves)
+                   for overrides, seed in jobs]
+        return [future.result() for future in futures]
+
+
+def write_csv(results, f):
+    """Schreibt die Ergebnisse als CSV (eine Zeile pro Lauf)"""
+    fields = [name for name in results[0] if name not in RESULT_FIELDS] + RESULT_FIELDS
+    writer = csv.DictWriter(f, fieldnames=fields)
+    writer.writeheader()
+    writer.writerows(results)
+
+
+def write_json(results, f):
+    """Schreibt die Ergebnisse als JSON-Liste"""
+    json.dump(results, f, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallele Headless-Simulation für Balance-Sweeps")
+    parser.add_argument('--set', action='append', default=[], metavar='NAME=WERT[,WERT...]',
+                        help="Einstellung aus settings.py, mehrfach angebbar (alle Kombinationen werden simuliert)")
+    parser.add_argument('--seeds', type=int, default=10, help="Anzahl Seeds pro Kombination")
+    parser.add_argument('--first-seed', type=int, default=0)
+    parser.add_argument('--max-ticks', type=int, default=FPS * 60 * 10,
+                        help="Abbruch nach so vielen Ticks (Standard: 10 Spielminuten)")
+    parser.add_argument('--max-waves', type=int, default=None)
+    parser.add_argument('--workers', type=int, default=None, help="Anzahl Prozesse (Standard: alle Kerne)")
+    parser.add_argument('--csv', help="Ergebnisse als CSV schreiben")
+    parser.add_argument('--json', help="Ergebnisse als JSON schreiben")
+    args = parser.parse_args()
+
+    sweep = parse_sweep(args.set)
+    seeds = range(args.first_seed, args.first_seed + args.seeds)
+    results = run_batch(sweep, seeds, args.max_ticks, args.max_waves, args.workers)
+
+    if args.csv:
+        with open(args.csv, 'w', newline='') as f:
+            write_csv(results, f)
+    if args.json:
+        with open(args.json, 'w') as f:
+            write_json(results, f)
+    if not args.csv and not args.json:
+        write_csv(results, sys.stdout)
+
+    # Kurze Zusammenfassung pro Kombination
+    for overrides in sweep:
+        runs = [r for r in results if all(r[name] == value for name, value in overrides.items())]
+        waves = sum(r['wave_reached'] for r in runs) / len(runs)
+        alive = sum(r['time_alive'] for r in runs) / len(runs)
+        damage = sum(r['damage_taken'] for r in runs) / len(runs)
+        print(f"{overrides or 'Standard'}: Welle {waves:.2f}, {alive:.1f} s, Schaden {damage:.1f}",
+              file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import pygame as pg
+from settings import *
+
+
+class RealClock:
+    """Spieluhr auf Basis der echten Zeit (pg.time), begrenzt auf FPS.
+
+    Die Spielzeit ist die Summe der Zeitdeltas aller Frames. Sie ändert sich
+    damit nur zwischen zwei Frames und lässt sich aus den Deltas exakt
+    wiederherstellen (Replays).
+    """
+
+    def __init__(self):
+        self.clock = pg.time.Clock()
+        self.time = 0
+
+    def tick(self, framerate=None):
+        """Wartet auf den nächsten Frame und gibt die vergangene Zeit in ms zurück"""
+        dt_ms = self.clock.tick(FPS if framerate is None else framerate)
+        self.time += dt_ms
+        return dt_ms
+
+    def get_ticks(self):
+        """Spielzeit in ms"""
+        return self.time
+
+
+class SimulatedClock:
+    """Simulierte Spieluhr mit festem Zeitschritt.
+
+    tick() wartet nicht, sondern schaltet die Spielzeit um genau einen Schritt
+    weiter. Damit läuft die Simulation so schnell wie die CPU es zulässt und
+    ist unabhängig von der echten Zeit reproduzierbar.
+    """
+
+    def __init__(self, step_ms=None):
+        self.step_ms = 1000 / FPS if step_ms is None else step_ms
+        self.time = 0.0
+
+    def tick(self, framerate=None):
+        """Schaltet einen festen Zeitschritt weiter und gibt ihn in ms zurück"""
+        self.time += self.step_ms
+        return self.step_ms
+
+    def get_ticks(self):
+        """Simulierte Spielzeit in ms"""
+        return self.time
@@ -0,0 +1,133 @@
+import pygame as pg
+from settings import *
+from sprites.powerup import AmmoPowerup
+
+
+class Controls:
+    """Basis-Klasse für Eingabequellen des Spielers.
+
+    update() wird einmal pro Tick aufgerufen und setzt den Eingabezustand:
+    move (Richtung je Achse -1, 0 oder 1), shooting und aim (Zielpunkt in
+    Weltkoordinaten).
+    """
+
+    def __init__(self):
+        self.move = pg.math.Vector2(0, 0)
+        self.shooting = False
+        self.aim = pg.math.Vector2(0, 0)
+
+    def update(self, game):
+        """Aktualisiert den Eingabezustand für den aktuellen Tick"""
+        pass  # In Unterklassen überschrieben
+
+
+class KeyboardMouseInput(Controls):
+    """Eingabe über Tastatur und Maus"""
+
+    def update(self, game):
+        """Liest Tastatur und Maus aus"""
+        keys = pg.key.get_pressed()
+        self.move.x = 0
+        self.move.y = 0
+
+        # Bewegung in 8 Richtungen
+        if keys[pg.K_LEFT] or keys[pg.K_a]:
+            self.move.x = -1
+        if keys[pg.K_RIGHT] or keys[pg.K_d]:
+            self.move.x = 1
+        if keys[pg.K_UP] or keys[pg.K_w]:
+            self.move.y = -1
+        if keys[pg.K_DOWN] or keys[pg.K_s]:
+            self.move.y = 1
+
+        # Linke Maustaste zum Schießen
+        self.shooting = pg.mouse.get_pressed()[0]
+        self.aim.update(game.camera.screen_to_world(pg.mouse.get_pos()))
+
+
+class ScriptedInput(Controls):
+    """Spielt eine feste Eingabefolge ab.
+
+    Jeder Eintrag ist ein Tupel (move_x, move_y, shooting, aim_x, aim_y) für
+    einen Tick. Nach dem Ende des Skripts bleibt der Spieler stehen.
+    """
+
+    def __init__(self, script):
+        super().__init__()
+        self.script = script
+        self.index = 0
+
+    def update(self, game):
+        """Übernimmt den nächsten Eintrag des Skripts"""
+        if self.index < len(self.script):
+            move_x, move_y, shooting, aim_x, aim_y = self.script[self.index]
+            self.index += 1
+        else:
+            move_x, move_y, shooting, aim_x, aim_y = 0, 0, False, self.aim.x, self.aim.y
+
+        self.move.update(move_x, move_y)
+        self.shooting = shooting
+        self.aim.update(aim_x, aim_y)
+
+
+class AutoPilotInput(Controls):
+    """Einfache KI als Spieler: zielt auf den nächsten sichtbaren Zombie, weicht aus und sammelt Munition.
+
+    Geschossen wird nur, wenn ein Grid-Ray vom Spieler zum Ziel frei ist,
+    damit keine Munition in Wände geht. Bei wenig Munition läuft die KI zum
+    nächsten sichtbaren Munitions-Power-Up, sofern kein Zombie zu nahe ist;
+    ist kein Zombie sichtbar, folgt sie dem A*-Pfad zum nächsten.
+    """
+
+    def __init__(self, flee_distance=None, low_ammo=None):
+        super().__init__()
+        self.flee_distance = AUTOPILOT_FLEE_DISTANCE if flee_distance is None else flee_distance
+        self.low_ammo = AUTOPILOT_LOW_AMMO if low_ammo is None else low_ammo
+
+    def update(self, game):
+        """Wählt den nächsten sichtbaren Zombie als Ziel"""
+        player = game.player.pos
+        collider = game.wall_collider
+        self.move.update(0, 0)
+        self.shooting = False
+
+        # Zombies nach Entfernung; der nächste bestimmt das Ausweichen, der nächste sichtbare
+        # in Reichweite der Projektile ist das Ziel
+        zombies = sorted(game.zombies, key=lambda zombie: player.distance_squared_to(zombie.pos))
+        reach = BULLET_SPEED_PER_SECOND * BULLET_LIFETIME / 1000
+        if zombies and game.player.ammo > 0:
+            for zombie in zombies:
+                if player.distance_squared_to(zombie.pos) > reach ** 2:
+                    break
+                # Projektile sind ein Quadrat: Strahlbreite bis zu seinen Ecken
+                if collider.line_of_sight(player, zombie.pos, BULLET_SIZE * 0.71):
+                    self.aim.update(zombie.pos)
+                    self.shooting = True
+                    break
+
+        # Zu nahe Zombies: in die Gegenrichtung ausweichen (nicht vor Zombies hinter Wänden)
+        if (zombies and player.distance_squared_to(zombies[0].pos) < self.flee_distance ** 2
+                and collider.line_of_sight(player, zombies[0].pos)):
+            self.move_towards(player, player * 2 - zombies[0].pos)
+            return
+
+        # Bei wenig Munition zum nächsten sichtbaren Munitions-Power-Up laufen
+        if game.player.ammo <= self.low_ammo:
+            ammo = [powerup for powerup in game.powerups if isinstance(powerup, AmmoPowerup)]
+            ammo.sort(key=lambda powerup: player.distance_squared_to(powerup.pos))
+            for powerup in ammo:
+                if collider.line_of_sight(player, powerup.pos):
+                    self.move_towards(player, powerup.pos)
+                    return
+
+        # Kein Zombie sichtbar (z.B. hinter Wänden festgelaufen): per A* zum nächsten laufen
+        if zombies and not self.shooting and game.player.ammo > 0:
+            path = game.pathfinder.find_path(player, zombies[0].pos)
+            if len(path) > 1:
+                self.move_towards(player, path[1])
+
+    def move_towards(self, player, target):
+        """Setzt die Bewegung (je Achse -1, 0 oder 1) in Richtung des Zielpunkts"""
+        direction = target - player
+        self.move.x = (direction.x > 0) - (direction.x < 0)
+        self.move.y = (direction.y > 0) - (direction.y < 0)
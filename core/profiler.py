@@ -0,0 +1,104 @@
+import csv
+import json
+import time
+from collections import deque
+from contextlib import nullcontext
+from settings import *
+
+
+class Section:
+    """Misst die Dauer eines Abschnitts und addiert sie zum aktuellen Frame"""
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        elapsed = (time.perf_counter() - self.start) * 1000
+        frame = self.profiler.frame
+        frame[self.name] = frame.get(self.name, 0) + elapsed
+
+
+class FrameProfiler:
+    """Misst die Abschnitte eines Frames (Events, Updates, Kollisionen, Zeichnen).
+
+    Abschnitte werden mit `with profiler.section('name'):` gemessen. Pro
+    Abschnitt bleiben die Zeiten der letzten `window` Frames für gleitende
+    Perzentile erhalten, optional zusätzlich alle Frames als Trace für den
+    Export nach JSON oder CSV. Ist der Profiler ausgeschaltet, kostet ein
+    Abschnitt nur einen Attributzugriff.
+    """
+
+    def __init__(self, enabled=None, window=None, trace=False):
+        self.enabled = PROFILER_ENABLED if enabled is None else enabled
+        self.window = PROFILER_WINDOW if window is None else window
+        self.trace = [] if trace else None
+
+        self.sections = {}  # Name -> Section
+        self.samples = {}  # Name -> deque der letzten Zeiten in ms
+        self.frame = {}  # Zeiten des laufenden Frames
+        self.frame_start = 0
+        self.frames = 0
+
+    def section(self, name):
+        """Kontextmanager, der die Dauer des Abschnitts misst"""
+        if not self.enabled:
+            return nullcontext()
+        section = self.sections.get(name)
+        if section is None:
+            section = self.sections[name] = Section(self, name)
+        return section
+
+    def begin_frame(self):
+        """Beginnt einen neuen Frame"""
+        self.frame = {}
+        self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        """Schließt den Frame ab und übernimmt seine Zeiten in die Statistik"""
+        if not self.enabled:
+            return
+        self.frame['frame'] = (time.perf_counter() - self.frame_start) * 1000
+        self.frames += 1
+
+        for name, elapsed in self.frame.items():
+            samples = self.samples.get(name)
+            if samples is None:
+                samples = self.samples[name] = deque(maxlen=self.window)
+            samples.append(elapsed)
+
+        if self.trace is not None:
+            self.trace.append(self.frame)
+
+    def percentiles(self, name, quantiles=(0.5, 0.95, 0.99)):
+        """Gleitende Perzentile eines Abschnitts in ms"""
+        samples = sorted(self.samples.get(name, ()))
+        if not samples:
+            return [0.0 for _ in quantiles]
+        return [samples[min(int(q * len(samples)), len(samples) - 1)] for q in quantiles]
+
+    def summary(self):
+        """p50/p95/p99 aller Abschnitte, der ganze Frame zuerst"""
+        names = sorted(self.samples, key=lambda name: (name != 'frame', name))
+        result = {}
+        for name in names:
+            p50, p95, p99 = self.percentiles(name)
+            result[name] = {'p50': p50, 'p95': p95, 'p99': p99}
+        return result
+
+    def dump(self, filename):
+        """Schreibt Zusammenfassung und Trace als JSON oder (bei .csv) den Trace als CSV"""
+        if filename.endswith('.csv'):
+            names = sorted({name for frame in self.trace or () for name in frame})
+            with open(filename, 'w', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=['index'] + names, restval=0)
+                writer.writeheader()
+                for index, frame in enumerate(self.trace or ()):
+                    writer.writerow(dict(frame, index=index))
+        else:
+            with open(filename, 'w') as f:
+                json.dump({'frames': self.frames, 'summary': self.summary(), 'trace': self.trace or []}, f)
@@ -0,0 +1,112 @@
+import struct
+import zlib
+import pygame as pg
+from settings import *
+from core.controls import Controls
+
+
+class Replay:
+    """Aufzeichnung einer Spielsitzung: Seed und Eingaben pro Frame.
+
+    Pro Frame werden das Zeitdelta der Spieluhr, ob das Spiel aktualisiert
+    wurde (nicht pausiert) und der Eingabezustand gespeichert. Zusammen mit
+    dem Seed des Spiel-RNG lässt sich die Sitzung damit Bit für Bit
+    wiederholen, solange dieselben Einstellungen gelten. Die Frames werden
+    binär gepackt und mit zlib komprimiert.
+    """
+
+    MAGIC = b'ZSRP'
+    VERSION = 1
+    HEADER = struct.Struct('<4sBQI')  # Kennung, Version, Seed, Anzahl Frames
+    MAX_SEED = 2 ** 64 - 1  # Seed wird vorzeichenlos mit 64 Bit gespeichert
+    FRAME = struct.Struct('<dbbBdd')  # dt (ms), move_x, move_y, Flags, aim_x, aim_y
+
+    # Bits im Flag-Byte
+    SHOOTING = 1
+    UPDATED = 2
+
+    def __init__(self, seed, frames=None):
+        self.seed = seed
+        self.frames = frames if frames is not None else []
+        self.index = 0  # Nächster Frame beim Abspielen
+
+    def record(self, dt_ms, updated, controls):
+        """Hängt den aktuellen Frame an die Aufzeichnung an"""
+        flags = (self.SHOOTING if controls.shooting else 0) | (self.UPDATED if updated else 0)
+        self.frames.append((dt_ms, int(controls.move.x), int(controls.move.y), flags,
+                            controls.aim.x, controls.aim.y))
+
+    def finished(self):
+        """True, wenn alle Frames abgespielt wurden"""
+        return self.index >= len(self.frames)
+
+    def next_frame(self):
+        """Gibt den nächsten Frame zurück und rückt weiter"""
+        frame = self.frames[self.index]
+        self.index += 1
+        return frame
+
+    def current_frame(self):
+        """Zuletzt mit next_frame() gelesener Frame"""
+        return self.frames[self.index - 1]
+
+    def save(self, filename):
+        """Speichert die Aufzeichnung als komprimierte Binärdatei"""
+        data = b''.join(self.FRAME.pack(*frame) for frame in self.frames)
+        with open(filename, 'wb') as f:
+            f.write(self.HEADER.pack(self.MAGIC, self.VERSION, self.seed, len(self.frames)))
+            f.write(zlib.compress(data, 9))
+
+    @classmethod
+    def load(cls, filename):
+        """Lädt eine mit save() gespeicherte Aufzeichnung"""
+        with open(filename, 'rb') as f:
+            magic, version, seed, count = cls.HEADER.unpack(f.read(cls.HEADER.size))
+            if magic != cls.MAGIC or version != cls.VERSION:
+                raise ValueError(f"Keine Replay-Datei (Version {cls.VERSION}): {filename}")
+            data = zlib.decompress(f.read())
+
+        frames = list(cls.FRAME.iter_unpack(data))
+        if len(frames) != count:
+            raise ValueError(f"Replay-Datei unvollständig: {filename}")
+        return cls(seed, frames)
+
+
+class ReplayClock:
+    """Spieluhr, die die aufgezeichneten Zeitdeltas wiedergibt.
+
+    Mit realtime=True wird zusätzlich auf FPS gebremst (gerendertes Abspielen),
+    sonst läuft das Replay so schnell wie möglich.
+    """
+
+    def __init__(self, replay, realtime=False):
+        self.replay = replay
+        self.clock = pg.time.Clock() if realtime else None
+        self.time = 0.0
+
+    def tick(self, framerate=None):
+        """Gibt das Zeitdelta des nächsten aufgezeichneten Frames zurück"""
+        if self.clock:
+            self.clock.tick(FPS if framerate is None else framerate)
+        dt_ms = self.replay.next_frame()[0]
+        self.time += dt_ms
+        return dt_ms
+
+    def get_ticks(self):
+        """Aufgezeichnete Spielzeit in ms"""
+        return self.time
+
+
+class ReplayInput(Controls):
+    """Eingabequelle, die die aufgezeichneten Eingaben wiedergibt"""
+
+    def __init__(self, replay):
+        super().__init__()
+        self.replay = replay
+
+    def update(self, game):
+        """Übernimmt die Eingaben des aktuellen Frames"""
+        dt_ms, move_x, move_y, flags, aim_x, aim_y = self.replay.current_frame()
+        self.move.update(move_x, move_y)
+        self.shooting = bool(flags & Replay.SHOOTING)
+        self.aim.update(aim_x, aim_y)
@@ -1,4 +1,6 @@
 import pygame as pg
+import argparse
+import random
 import sys
 from os import path
 from settings import *
@@ -6,18 +8,69 @@ from sprites.player import Player
 from sprites.zombie import NormalZombie, FastZombie, StrongZombie
 from sprites.projectile import Bullet
 from sprites.powerup import HealthPowerup, AmmoPowerup, SpeedPowerup
+from sprites.zombie_swarm import ZombieSwarm
+from sprites.ai_scheduler import AIScheduler
+from sprites.pool import SpritePool
+from sprites.bullet_system import BulletSystem
 from world.map import Map
+from world.camera import Camera
+from world.crowd import CrowdSteering
+from world.collision import WallCollider
+from world.flowfield import FlowField
+from world.pathfinding import PathFinder
+from world.hierarchical import HierarchicalPathFinder
+from world.path_scheduler import PathRequestQueue
+from world.spatial_hash import SpatialHash, spritecollide, groupcollide
 from waves.wave_manager import WaveManager
 from ui.hud import HUD
+from ui.renderer import DirtyRectRenderer
+from core.clock import RealClock, SimulatedClock
+from core.controls import KeyboardMouseInput, AutoPilotInput
+from core.replay import Replay, ReplayClock, ReplayInput
+from core.profiler import FrameProfiler
 
 
 class Game:
-    def __init__(self):
+    def __init__(self, headless=False, clock=None, controls=None,
+                 max_ticks=HEADLESS_MAX_TICKS, max_waves=HEADLESS_MAX_WAVES,
+                 seed=None, record=None, replay=None, profile=None):
         pg.init()
-        pg.mixer.init()  # Für Sound-Effekte
-        self.screen = pg.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pg.display.set_caption(TITLE)
-        self.clock = pg.time.Clock()
+        self.headless = headless
+        if headless:
+            # Ohne Fenster: gezeichnet wird höchstens in eine Surface im Speicher
+            self.screen = pg.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        else:
+            pg.mixer.init()  # Für Sound-Effekte
+            self.screen = pg.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+            pg.display.set_caption(TITLE)
+
+        # Replay abspielen: Seed, Zeitdeltas und Eingaben kommen aus der Aufzeichnung
+        self.replay = replay
+        if replay:
+            seed = replay.seed
+            clock = ReplayClock(replay, realtime=not headless)
+            controls = ReplayInput(replay)
+
+        # Spieluhr: echte Zeit oder simulierter fester Zeitschritt
+        self.clock = clock or (SimulatedClock() if headless else RealClock())
+
+        # Eingabequelle: Tastatur/Maus, Skript oder KI
+        self.controls = controls or (AutoPilotInput() if headless else KeyboardMouseInput())
+
+        # Seed für das Spiel-RNG (None = bei jedem Spiel ein neuer) und Datei für die Aufzeichnung
+        self.seed = seed
+        self.record = record
+        self.recording = None
+        self.session = 0  # Nummer des aktuellen Spiels (Neustart mit R zählt weiter)
+
+        # Frame-Profiler; mit profile wird jeder Frame aufgezeichnet und am Ende gespeichert
+        self.profile = profile
+        self.profiler = FrameProfiler(enabled=PROFILER_ENABLED or bool(profile), trace=bool(profile))
+        self.show_profiler = False
+
+        # Abbruchbedingungen für die Headless-Simulation
+        self.max_ticks = max_ticks
+        self.max_waves = max_waves
         self.load_data()
         self.running = True
         self.paused = False
@@ -62,40 +115,167 @@ class Game:
         self.speed_powerup_img = pg.Surface((TILESIZE // 2, TILESIZE // 2), pg.SRCALPHA)
         pg.draw.rect(self.speed_powerup_img, BLUE, (0, 0, TILESIZE // 2, TILESIZE // 2))
 
+        # Pause- und Game-Over-Bildschirm: Overlay und Schriften einmalig erzeugen
+        self.overlay_img = pg.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pg.SRCALPHA)
+        self.overlay_img.fill((0, 0, 0, 128))  # Halb-transparentes Schwarz
+        self.title_font = pg.font.Font(None, 64)
+        self.menu_font = pg.font.Font(None, 32)
+
     def new(self):
         """Startet ein neues Spiel"""
+        self.setup()
+
+        # Spiel starten
+        self.run()
+
+        # Pathfinding-Worker beenden
+        self.path_queue.shutdown()
+
+        # Aufzeichnung der Sitzung speichern (jede Sitzung in eine eigene Datei)
+        if self.recording:
+            self.recording.save(self.record_filename())
+
+        # Profiler-Trace speichern
+        if self.profile:
+            self.profiler.dump(self.profile)
+
+    def record_filename(self):
+        """Datei für die Aufzeichnung; ab dem zweiten Spiel mit Sitzungsnummer (spiel-2.rep, ...)"""
+        if self.session <= 1:
+            return self.record
+        root, ext = path.splitext(self.record)
+        return f"{root}-{self.session}{ext}"
+
+    def setup(self):
+        """Baut Spielwelt, Spieler und Subsysteme für ein neues Spiel auf"""
+        self.session += 1
+
+        # Gemeinsamer Zufallsgenerator für Karte, Wellen und Drops
+        self.session_seed = self.seed if self.seed is not None else random.randrange(2 ** 32)
+        self.rng = random.Random(self.session_seed)
+        if self.record:
+            self.recording = Replay(self.session_seed)
+
         # Sprite-Gruppen erstellen
         self.all_sprites = pg.sprite.Group()
-        self.walls = pg.sprite.Group()
         self.zombies = pg.sprite.Group()
         self.bullets = pg.sprite.Group()
         self.powerups = pg.sprite.Group()
 
+        # Objekt-Pools für Projektile und Power-Ups
+        self.bullet_pool = SpritePool(lambda pool: Bullet(self, 0, 0, 0, 0, pool), BULLET_POOL_SIZE)
+        self.powerup_pools = {
+            powerup_class: SpritePool(lambda pool, cls=powerup_class: cls(self, 0, 0, pool), POWERUP_POOL_SIZE)
+            for powerup_class in (HealthPowerup, AmmoPowerup, SpeedPowerup)
+        }
+
         # Spielkarte laden
         self.map = Map(self)
+        self.wall_collider = WallCollider(self.map)
 
-        # Spieler erstellen
-        self.player = Player(self, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+        # Broad Phase für Kollisionen zwischen beweglichen Sprites
+        self.bullet_hash = SpatialHash()
+        self.zombie_hash = SpatialHash()
+        self.powerup_hash = SpatialHash()
+
+        # Spieler in der Kartenmitte erstellen
+        self.player = Player(self, self.map.pixel_width // 2, self.map.pixel_height // 2)
         self.all_sprites.add(self.player)
 
+        # Kamera folgt dem Spieler
+        self.camera = Camera(self.map)
+        self.camera.update(self.player.pos)
+
+        # Statische Ebene: Boden und Wände im vorgerenderten Karten-Hintergrund (weder update noch blit pro Wand)
+        # Dynamische Ebenen von unten nach oben, jeweils mit dem Spatial Hash für das Culling;
+        # der Spieler wird zuletzt gezeichnet
+        self.render_layers = ((self.powerups, self.powerup_hash),
+                              (self.zombies, self.zombie_hash),
+                              (self.bullets, self.bullet_hash))
+
+        # Gemeinsames Flow Field für die Zombie-Navigation
+        self.flow_field = FlowField(self)
+
+        # A*-Pathfinding (optional hierarchisch) mit zeitlich verteilter Anfragewarteschlange;
+        # Aufzeichnung und Replay brauchen ein von der Rechenzeit unabhängiges Budget
+        self.pathfinder = PathFinder(self)
+        request_budget = PATHFINDING_REPLAY_REQUESTS if self.record or self.replay else None
+        if ZOMBIE_NAVIGATION == 'hpa':
+            self.path_queue = PathRequestQueue(HierarchicalPathFinder(self.pathfinder), request_budget=request_budget)
+        else:
+            self.path_queue = PathRequestQueue(self.pathfinder, request_budget=request_budget)
+
+        # Optionale Batch-Simulation der Projektile (NumPy)
+        self.bullet_system = BulletSystem(self) if BATCHED_BULLETS else None
+
+        # Optionale Batch-Simulation der Zombies (NumPy)
+        self.zombie_swarm = ZombieSwarm(self) if BATCHED_ZOMBIES else None
+
+        # Detailstufen der Zombie-KI: entfernte Zombies denken seltener
+        self.ai_scheduler = AIScheduler(self) if AI_LOD else None
+
+        # Schwarmverhalten der Zombies mit eigenem Nachbargitter
+        self.crowd = CrowdSteering(self) if CROWD_STEERING else None
+
         # Wellen-Manager initialisieren
         self.wave_manager = WaveManager(self)
 
         # HUD initialisieren
         self.hud = HUD(self)
 
-        # Spiel starten
-        self.run()
+        # Optionaler Dirty-Rect-Renderer
+        self.renderer = DirtyRectRenderer(self) if DIRTY_RECT_RENDERING else None
+
+        # Tile-Änderungen zur Laufzeit (z.B. zerstörte Wände) nur in der betroffenen Region nachziehen.
+        # Der PathFinder muss vor dem HPA*-Graphen aktualisiert werden, die Warteschlange reicht
+        # Änderungen an ihren Worker weiter.
+        # Schwarm und Projektile lesen den gemeinsamen Tile-Puffer direkt und brauchen keine Benachrichtigung
+        listeners = [self.pathfinder, self.path_queue.pathfinder, self.path_queue, self.renderer]
+        for listener in listeners:
+            if listener and listener not in self.map.listeners:
+                self.map.add_listener(listener)
 
     def run(self):
-        """Game-Loop"""
+        """Game-Loop (im Headless-Modus ohne Events und ohne Zeichnen)"""
+        self.ticks = 0
         self.playing = True
         while self.playing:
-            self.dt = self.clock.tick(FPS) / 1000.0  # Zeitdelta in Sekunden
-            self.events()
-            if not self.paused and not self.game_over:
+            dt_ms = self.clock.tick(FPS)
+            self.dt = dt_ms / 1000.0  # Zeitdelta in Sekunden
+            self.profiler.begin_frame()
+            if not self.headless:
+                with self.profiler.section('events'):
+                    self.events()
+
+            updating = self.should_update()
+            if updating:
                 self.update()
-            self.draw()
+                self.ticks += 1
+            if self.recording:
+                self.recording.record(dt_ms, updating, self.controls)
+
+            if not self.headless:
+                self.draw()
+            self.profiler.end_frame()
+            self.check_finished()
+
+    def should_update(self):
+        """Entscheidet, ob in diesem Frame die Spielwelt aktualisiert wird"""
+        if self.replay:
+            return bool(self.replay.current_frame()[3] & Replay.UPDATED)
+        return not self.paused and not self.game_over
+
+    def check_finished(self):
+        """Beendet Replay und Headless-Simulation (Ende der Aufzeichnung, Game Over oder Limit)"""
+        if self.replay and self.replay.finished():
+            self.playing = False
+            self.running = False
+
+        if self.headless and (self.game_over
+                              or (self.max_ticks is not None and self.ticks >= self.max_ticks)
+                              or (self.max_waves is not None and self.wave_manager.current_wave >= self.max_waves)):
+            self.playing = False
+            self.running = False
 
     def events(self):
         """Event-Handler"""
@@ -108,34 +288,92 @@ class Game:
                 if event.key == pg.K_ESCAPE:
                     self.paused = not self.paused
 
+                # Profiler-Overlay ein-/ausblenden (startet auch die Messung)
+                if event.key == pg.K_F3:
+                    self.show_profiler = not self.show_profiler
+                    if self.show_profiler:
+                        self.profiler.enabled = True
+
                 if self.game_over and event.key == pg.K_r:
                     self.game_over = False  # Game Over-Status zurücksetzen
                     self.playing = False    # Aktuelle Spielschleife beenden, damit new() aufgerufen wird
 
     def update(self):
         """Aktualisiert alle Sprites und Spielzustände"""
+        profiler = self.profiler
+
+        # Eingaben für diesen Tick übernehmen
+        self.controls.update(self)
+
         # Wellen-Manager aktualisieren
-        self.wave_manager.update()
+        with profiler.section('wave_manager'):
+            self.wave_manager.update()
+
+        # Navigation: Flow Field bei Bedarf neu berechnen oder Pfadanfragen bearbeiten
+        with profiler.section('navigation'):
+            if ZOMBIE_NAVIGATION in ('astar', 'hpa'):
+                self.path_queue.update()
+            else:
+                self.flow_field.update()
+
+        # Zombies im Batch bewegen
+        if self.zombie_swarm:
+            with profiler.section('zombie_swarm'):
+                self.zombie_swarm.update(self.dt)
+
+        # Festlegen, welche Zombies in diesem Tick denken
+        if self.ai_scheduler:
+            with profiler.section('ai_scheduler'):
+                self.ai_scheduler.update(self.zombies)
+
+        # Nachbargitter für das Schwarmverhalten mit dem Zustand vom Beginn des Ticks
+        if self.crowd:
+            with profiler.section('crowd'):
+                self.crowd.rebuild(self.zombies)
 
         # Alle Sprites aktualisieren
-        self.all_sprites.update()
+        with profiler.section('all_sprites'):
+            self.all_sprites.update()
+
+        # Zombies in die Broad Phase eintragen (für Projektile und Spieler)
+        with profiler.section('zombie_hash'):
+            self.zombie_hash.rebuild(self.zombies)
 
         # Kollisionserkennung für Projektile
-        hits = pg.sprite.groupcollide(self.zombies, self.bullets, False, True)
-        for zombie, bullets in hits.items():
-            for bullet in bullets:
-                zombie.take_damage(BULLET_DAMAGE)
+        with profiler.section('collide_bullets'):
+            if self.bullet_system:
+                # Bewegung, Wand- und Zombie-Treffer aller Projektile als Batch
+                for zombie in self.bullet_system.update(self.dt, self.zombie_hash):
+                    if zombie.alive():
+                        zombie.take_damage(BULLET_DAMAGE)
+            else:
+                self.bullet_hash.rebuild(self.bullets)
+                hits = groupcollide(self.zombies, self.bullet_hash, False, True)
+                for zombie, bullets in hits.items():
+                    for bullet in bullets:
+                        zombie.take_damage(BULLET_DAMAGE)
 
         # Kollision Spieler mit Zombies
-        hits = pg.sprite.spritecollide(self.player, self.zombies, False)
-        for zombie in hits:
-            self.player.take_damage(zombie.damage)
-            # Knockback könnte hier hinzugefügt werden
+        with profiler.section('collide_player'):
+            hits = spritecollide(self.player, self.zombie_hash, False)
+            for zombie in hits:
+                self.player.take_damage(zombie.damage)
+                # Knockback könnte hier hinzugefügt werden
+
+        # Nur Power-Ups im sichtbaren Bereich animieren (Spatial Hash des letzten Ticks)
+        with profiler.section('powerups'):
+            for powerup in self.powerup_hash.query(self.camera.cull_rect()):
+                powerup.update()
 
         # Kollision Spieler mit Power-Ups
-        hits = pg.sprite.spritecollide(self.player, self.powerups, True)
-        for powerup in hits:
-            powerup.apply(self.player)
+        with profiler.section('collide_powerups'):
+            self.powerup_hash.rebuild(self.powerups)
+            hits = spritecollide(self.player, self.powerup_hash, True)
+            for powerup in hits:
+                powerup.apply(self.player)
+
+        # Kamera auf die neue Spielerposition setzen
+        self.camera.update(self.player.pos)
 
         # Prüfen, ob Spieler tot ist
         if self.player.health <= 0:
@@ -143,17 +381,22 @@ class Game:
 
     def draw(self):
         """Rendert den Spielbildschirm"""
-        self.screen.fill(DARKGREY)
+        if self.renderer:
+            self.renderer.draw()
+            return
+        profiler = self.profiler
 
-        # Karte zeichnen
-        self.map.draw(self.screen)
+        # Sichtbaren Teil der Karte zeichnen (Hintergrund deckt den ganzen Bildschirm ab)
+        with profiler.section('map_draw'):
+            self.map.draw(self.screen, self.camera.offset)
 
-        # Alle Sprites zeichnen
-        for sprite in self.all_sprites:
-            self.screen.blit(sprite.image, sprite.rect)
+        # Alle dynamischen Sprites mit einem Blit-Aufruf zeichnen
+        with profiler.section('sprites_draw'):
+            self.draw_sprites()
 
         # HUD zeichnen
-        self.hud.draw()
+        with profiler.section('hud_draw'):
+            self.hud.draw()
 
         # Pause- oder Game-Over-Bildschirm anzeigen
         if self.paused:
@@ -161,48 +404,93 @@ class Game:
         elif self.game_over:
             self.draw_game_over_screen()
 
-        pg.display.flip()
+        # Headless wird nur in die Surface gezeichnet
+        if not self.headless:
+            with profiler.section('flip'):
+                pg.display.flip()
+
+    def draw_sprites(self):
+        """Zeichnet alle dynamischen Sprites ebenenweise mit einem Surface.blits-Aufruf.
+
+        Ist die Karte größer als der Bildschirm, werden nur Sprites im
+        sichtbaren Bereich (plus Rand) über die Spatial Hashes gezeichnet.
+        Gibt die bemalten Bereiche zurück (für den Dirty-Rect-Renderer).
+        """
+        camera = self.camera
+        cull_rect = None if camera.covers_map() else camera.cull_rect()
+        ox, oy = camera.offset
+
+        sequence = []
+        for group, spatial_hash in self.render_layers:
+            sprites = group if cull_rect is None else spatial_hash.query(cull_rect)
+            if ox or oy:
+                sequence.extend((sprite.image, sprite.rect.move(-ox, -oy)) for sprite in sprites)
+            else:
+                sequence.extend((sprite.image, sprite.rect) for sprite in sprites)
+
+        # Projektile aus dem Batch-System liegen auf der Ebene der Projektile
+        if self.bullet_system:
+            sequence.extend(self.bullet_system.blit_sequence(camera.offset, cull_rect))
+
+        sequence.append((self.player.image, self.player.rect.move(-ox, -oy)))
+        return self.screen.blits(sequence)
 
     def draw_pause_screen(self):
         """Zeigt Pause-Bildschirm an"""
-        s = pg.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pg.SRCALPHA)
-        s.fill((0, 0, 0, 128))  # Halb-transparentes Schwarz
-        self.screen.blit(s, (0, 0))
+        render_text = self.hud.render_text
+        self.screen.blit(self.overlay_img, (0, 0))
 
-        font = pg.font.Font(None, 64)
-        text = font.render("PAUSED", True, WHITE)
+        text = render_text(self.title_font, "PAUSED", WHITE)
         text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
         self.screen.blit(text, text_rect)
 
-        font = pg.font.Font(None, 32)
-        text = font.render("Press ESC to continue", True, WHITE)
+        text = render_text(self.menu_font, "Press ESC to continue", WHITE)
         text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50))
         self.screen.blit(text, text_rect)
 
     def draw_game_over_screen(self):
         """Zeigt Game-Over-Bildschirm an"""
-        s = pg.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pg.SRCALPHA)
-        s.fill((0, 0, 0, 128))  # Halb-transparentes Schwarz
-        self.screen.blit(s, (0, 0))
+        render_text = self.hud.render_text
+        self.screen.blit(self.overlay_img, (0, 0))
 
-        font = pg.font.Font(None, 64)
-        text = font.render("GAME OVER", True, RED)
+        text = render_text(self.title_font, "GAME OVER", RED)
         text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
         self.screen.blit(text, text_rect)
 
-        font = pg.font.Font(None, 32)
-        text = font.render(f"Wave: {self.wave_manager.current_wave}", True, WHITE)
+        text = render_text(self.menu_font, f"Wave: {self.wave_manager.current_wave}", WHITE)
         text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50))
         self.screen.blit(text, text_rect)
 
-        text = font.render("Press R to restart", True, WHITE)
+        text = render_text(self.menu_font, "Press R to restart", WHITE)
         text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 100))
         self.screen.blit(text, text_rect)
 
 
+def seed_argument(value):
+    """Argumenttyp für --seed: ganze Zahl, die in die Replay-Datei passt"""
+    try:
+        seed = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Seed muss eine ganze Zahl sein: {value}")
+    if not 0 <= seed <= Replay.MAX_SEED:
+        raise argparse.ArgumentTypeError(f"Seed muss zwischen 0 und {Replay.MAX_SEED} liegen: {value}")
+    return seed
+
+
 # Hauptprogramm
 if __name__ == "__main__":
-    g = Game()
+    parser = argparse.ArgumentParser(description=TITLE)
+    parser.add_argument('--headless', action='store_true',
+                        help="KI-gesteuerte Simulation ohne Fenster (bzw. Replay mit maximaler Geschwindigkeit)")
+    parser.add_argument('--seed', type=seed_argument, help="Seed für Karte, Wellen und Drops")
+    parser.add_argument('--record', metavar='DATEI', help="Eingaben jeder Sitzung aufzeichnen (ab dem zweiten Spiel DATEI-2, DATEI-3, ...)")
+    parser.add_argument('--replay', metavar='DATEI', help="Aufgezeichnete Sitzung abspielen")
+    parser.add_argument('--profile', metavar='DATEI', help="Frame-Zeiten messen und als JSON/CSV speichern")
+    args = parser.parse_args()
+
+    replay = Replay.load(args.replay) if args.replay else None
+    g = Game(headless=args.headless, seed=args.seed, record=args.record, replay=replay,
+             profile=args.profile)
     while g.running:
         g.new()
     pg.quit()
@@ -1,10 +1,27 @@
 # Globale Konstanten für das Zombie-Survival-Spiel
 
+# Abgeleitete Einstellungen: Name -> (Eingaben, Berechnung). Die Standardwerte unten werden
+# damit berechnet; core.batch berechnet sie neu, wenn eine ihrer Eingaben überschrieben wird
+DERIVED_SETTINGS = {
+    'BULLET_SPEED_PER_SECOND': (('BULLET_SPEED', 'FPS'), lambda speed, fps: speed * fps),
+    'GRIDWIDTH': (('SCREEN_WIDTH', 'TILESIZE'), lambda width, tilesize: width // tilesize),
+    'GRIDHEIGHT': (('SCREEN_HEIGHT', 'TILESIZE'), lambda height, tilesize: height // tilesize),
+}
+
+
+def derive_setting(name, values):
+    """Berechnet eine abgeleitete Einstellung aus den Werten ihrer Eingaben (Name -> Wert)"""
+    inputs, formula = DERIVED_SETTINGS[name]
+    return formula(*(values[key] for key in inputs))
+
+
 # Bildschirmeinstellungen
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 FPS = 60
 TITLE = "Zombie Survival"
+DIRTY_RECT_RENDERING = False  # Nur veränderte Bildschirmbereiche aktualisieren
+HUD_TEXT_CACHE_SIZE = 64  # Anzahl gerenderter HUD-Texte im LRU-Cache
 
 # Farben (RGB)
 WHITE = (255, 255, 255)
@@ -27,6 +44,12 @@ BULLET_SPEED = 10
 BULLET_LIFETIME = 1000  # in ms
 BULLET_SIZE = 8
 BULLET_DAMAGE = 25
+BULLET_POOL_SIZE = 64  # Vorab erzeugte Projektile
+
+# Batch-Simulation der Projektile mit NumPy (Bewegung mit dt, Ray-March gegen Wände)
+BATCHED_BULLETS = False
+BULLET_SPEED_PER_SECOND = derive_setting('BULLET_SPEED_PER_SECOND', globals())  # BULLET_SPEED gilt pro Frame bei FPS
+BULLET_SYSTEM_CAPACITY = 256  # Anfangsgröße der Arrays, wächst bei Bedarf
 
 # Zombie-Einstellungen
 # Standard-Zombie
@@ -34,31 +57,90 @@ ZOMBIE_NORMAL_SPEED = 20
 ZOMBIE_NORMAL_HEALTH = 100
 ZOMBIE_NORMAL_DAMAGE = 10
 ZOMBIE_NORMAL_SIZE = 32
+ZOMBIE_NORMAL_THINK_INTERVALS = (1, 3, 6)  # Denkintervall in Ticks (nah, mittel, fern)
 
 # Schneller Zombie
 ZOMBIE_FAST_SPEED = 4
 ZOMBIE_FAST_HEALTH = 50
 ZOMBIE_FAST_DAMAGE = 5
 ZOMBIE_FAST_SIZE = 30
+ZOMBIE_FAST_THINK_INTERVALS = (1, 2, 4)  # Denkintervall in Ticks (nah, mittel, fern)
 
 # Starker Zombie
 ZOMBIE_STRONG_SPEED = 1.5
 ZOMBIE_STRONG_HEALTH = 200
 ZOMBIE_STRONG_DAMAGE = 20
 ZOMBIE_STRONG_SIZE = 40
+ZOMBIE_STRONG_THINK_INTERVALS = (1, 4, 8)  # Denkintervall in Ticks (nah, mittel, fern)
+ZOMBIE_WALL_BREAK_COOLDOWN = 3000  # Zeit in ms, bevor ein starker Zombie die nächste Wand zerstört
+
+# Detailstufen der Zombie-KI nach Entfernung zum Spieler
+AI_LOD = True  # Entfernte Zombies denken seltener (siehe *_THINK_INTERVALS)
+AI_LOD_NEAR_DISTANCE = 300  # Bis zu dieser Entfernung in Pixeln: nah
+AI_LOD_FAR_DISTANCE = 700  # Ab dieser Entfernung: fern (nur Bewegung in gespeicherter Richtung)
+
+# Batch-Simulation aller Zombies mit NumPy
+BATCHED_ZOMBIES = False
+ZOMBIE_SWARM_CAPACITY = 256  # Anfangsgröße der Arrays, wächst bei Bedarf
 
 # Wellen-Einstellungen
 WAVE_COOLDOWN = 5000  # Pause zwischen Wellen in ms
 WAVE_BASE_ZOMBIES = 5  # Anzahl Zombies in erster Welle
 WAVE_ZOMBIE_INCREMENT = 3  # Zusätzliche Zombies pro Welle
+WAVE_SPAWNS_PER_FRAME = 2  # Maximal gespawnte Zombies pro Frame, der Rest wartet in der Warteschlange
+WAVE_MAX_ALIVE_ZOMBIES = 60  # Obergrenze gleichzeitig lebender Zombies
+WAVE_SPAWN_MIN_DISTANCE = 200  # Mindestabstand eines Spawn-Punkts zum Spieler in Pixeln
+WAVE_SPAWN_EDGE_TILES = 2  # Passt die Karte auf einen Bildschirm: Spawn-Tiles höchstens so weit vom Kartenrand
+WAVE_SPAWN_RING_TILES = 2  # Breite des Spawn-Rings außerhalb des Culling-Bereichs in Tiles
 
 # Power-Up-Einstellungen
 POWERUP_DURATION = 5000  # Dauer in ms
 HEALTH_POWERUP_AMOUNT = 25
 AMMO_POWERUP_AMOUNT = 10
 SPEED_POWERUP_MULTIPLIER = 1.5
+POWERUP_POOL_SIZE = 8  # Vorab erzeugte Power-Ups pro Typ
 
 # Karten-Einstellungen
 TILESIZE = 32
-GRIDWIDTH = SCREEN_WIDTH // TILESIZE
-GRIDHEIGHT = SCREEN_HEIGHT // TILESIZE
\ No newline at end of file
+GRIDWIDTH = derive_setting('GRIDWIDTH', globals())  # Bildschirmbreite in Tiles
+GRIDHEIGHT = derive_setting('GRIDHEIGHT', globals())  # Bildschirmhöhe in Tiles
+MAP_WIDTH = GRIDWIDTH  # Kartenbreite in Tiles (größer als der Bildschirm: Kamera scrollt mit)
+MAP_HEIGHT = GRIDHEIGHT  # Kartenhöhe in Tiles
+MAP_OBSTACLES = 20  # Hindernisse pro Bildschirmfläche, wächst mit der Kartengröße
+MAP_CHUNK_SIZE = 16  # Kantenlänge der vorgerenderten Hintergrund-Abschnitte in Tiles
+MAP_CHUNK_CACHE_SIZE = 64  # Maximal gespeicherte Hintergrund-Abschnitte (zuletzt benutzte bleiben)
+
+# Kamera-Einstellungen
+CAMERA_CULL_MARGIN = 64  # Rand um den sichtbaren Bereich für Zeichnen und Animation in Pixeln
+
+# Kollisions-Einstellungen
+SPATIAL_HASH_CELL_SIZE = 64  # Zellgröße des Spatial Hash in Pixeln
+
+# Schwarmverhalten der Zombies (Boids)
+CROWD_STEERING = True  # Separation, Alignment und Wandausweichen für Zombies
+CROWD_NEIGHBOR_RADIUS = 48  # Nachbarradius in Pixeln, zugleich Zellgröße des Nachbargitters
+CROWD_SEPARATION_WEIGHT = 1.5  # Gewicht der Abstoßung überlappender Zombies
+CROWD_ALIGNMENT_WEIGHT = 0.3  # Gewicht der mittleren Laufrichtung der Nachbarn
+CROWD_WALL_WEIGHT = 1.0  # Gewicht der Abstoßung von Wänden
+CROWD_WALL_DISTANCE = 8  # Tastweite vor dem Zombie (zusätzlich zur halben Größe) für das Wandausweichen
+
+# Pathfinding-Einstellungen
+PATHFINDING_MAX_NODES = 2000  # Maximal expandierte Knoten pro A*-Suche
+PATH_CACHE_SIZE = 256  # Anzahl gespeicherter Pfade im LRU-Cache
+PATHFINDING_BUDGET_MS = 2.0  # Zeitbudget für Pfadsuchen pro Frame
+PATHFINDING_WORKER = None  # None, 'thread' oder 'process' (Suchen außerhalb des Spiel-Threads)
+PATHFINDING_REPLAY_REQUESTS = 4  # Pfadsuchen pro Frame bei Aufzeichnung/Replay (statt Zeitbudget und Worker, deterministisch)
+ZOMBIE_NAVIGATION = 'flowfield'  # 'flowfield', 'astar' oder 'hpa'
+FLOW_FIELD_MAX_DISTANCE = 64  # Reichweite des Flow Fields in Tiles, weiter entfernte Zombies laufen direkt auf den Spieler zu
+HPA_CLUSTER_SIZE = 10  # Kantenlänge eines HPA*-Clusters in Tiles
+HPA_WIDE_ENTRANCE = 6  # Ab dieser Breite bekommt ein Eingang zwei Übergänge
+
+# Headless-Simulation (ohne Fenster und Rendering, mit simulierter Uhr)
+HEADLESS_MAX_TICKS = None  # Abbruch nach so vielen Ticks (None = bis Game Over)
+HEADLESS_MAX_WAVES = None  # Abbruch, sobald diese Welle erreicht ist (None = bis Game Over)
+AUTOPILOT_FLEE_DISTANCE = 150  # Abstand, ab dem die Spieler-KI vor Zombies ausweicht
+AUTOPILOT_LOW_AMMO = 10  # Ab dieser Munition sammelt die Spieler-KI sichtbare Munitions-Power-Ups ein
+
+# Frame-Profiler (Umschalten im Spiel mit F3)
+PROFILER_ENABLED = False  # Messung schon beim Start aktiv
+PROFILER_WINDOW = 300  # Anzahl Frames für die gleitenden Perzentile
\ No newline at end of file
@@ -0,0 +1,65 @@
+from settings import *
+
+
+# Detailstufen (Index in think_intervals der Zombies)
+LOD_NEAR = 0
+LOD_MID = 1
+LOD_FAR = 2
+
+
+class AIScheduler:
+    """Verteilt das Denken der Zombies (Navigation und Schwarmkräfte) über die Ticks.
+
+    Einmal pro Tick wird jeder Zombie nach seiner Entfernung zum Spieler
+    einer Detailstufe zugeordnet. Nahe Zombies denken jeden Tick, mittlere
+    und ferne nur alle think_intervals[Stufe] Ticks. Jeder Zombie bekommt
+    beim ersten Tick eine feste Phase, so denkt pro Tick nur ein gleich
+    großer Teil der Zombies einer Klasse und Stufe (Round Robin). Ferne
+    Zombies bewegen sich dazwischen ohne die volle Wandkollision weiter
+    (siehe Zombie.update).
+    """
+
+    def __init__(self, game):
+        self.game = game
+        self.tick = 0
+        self.next_phase = {}  # Zombie-Klasse -> nächste freie Phase
+        self.counts = [0, 0, 0]  # Zombies pro Stufe im letzten Tick
+        self.thinking = 0  # Denkende Zombies im letzten Tick
+
+    def update(self, zombies):
+        """Ordnet alle Zombies ihrer Stufe zu und legt fest, wer in diesem Tick denkt"""
+        self.tick += 1
+        tick = self.tick
+        player = self.game.player.pos
+        px, py = player.x, player.y
+        near_sq = AI_LOD_NEAR_DISTANCE ** 2
+        far_sq = AI_LOD_FAR_DISTANCE ** 2
+
+        counts = [0, 0, 0]
+        thinking = 0
+        for zombie in zombies:
+            if zombie.think_phase is None:
+                # Phasen pro Klasse fortlaufend, damit jede Klasse gleichmäßig verteilt denkt
+                phase = self.next_phase.get(type(zombie), 0)
+                zombie.think_phase = phase
+                self.next_phase[type(zombie)] = phase + 1
+
+            dx, dy = zombie.pos.x - px, zombie.pos.y - py
+            dist_sq = dx * dx + dy * dy
+            if dist_sq <= near_sq:
+                lod = LOD_NEAR
+            elif dist_sq < far_sq:
+                lod = LOD_MID
+            else:
+                lod = LOD_FAR
+            zombie.lod = lod
+            counts[lod] += 1
+
+            # Blockierte ferne Zombies (force_think) denken sofort neu
+            interval = zombie.think_intervals[lod]
+            zombie.think_now = zombie.force_think or (tick + zombie.think_phase) % interval == 0
+            zombie.force_think = False
+            thinking += zombie.think_now
+
+        self.counts = counts
+        self.thinking = thinking
@@ -0,0 +1,188 @@
+import pygame as pg
+from settings import *
+from sprites.slot_arrays import SlotArrays
+
+try:
+    import numpy as np
+except ImportError:  # numpy ist nur für BATCHED_BULLETS nötig
+    np = None
+
+
+class BulletSystem(SlotArrays):
+    """Alle Projektile als Batch in zusammenhängenden NumPy-Arrays.
+
+    Pro Tick werden alle Projektile mit dt integriert. Wandtreffer werden mit
+    einem vektorisierten DDA-Ray-March über die Tiles der zurückgelegten
+    Strecke bestimmt, Zombie-Treffer als Schnitt der Strecke mit den um den
+    Projektilradius vergrößerten Zombie-Rects. Schnelle Projektile können so
+    weder durch Wände noch durch Zombies hindurchtunneln.
+    """
+
+    ARRAYS = ('pos', 'dir', 'spawn_time', 'active')
+
+    def __init__(self, game, capacity=None):
+        if np is None:
+            raise ImportError("BATCHED_BULLETS benötigt numpy")
+
+        super().__init__()
+        self.game = game
+        self.image = game.bullet_img
+        self.radius = BULLET_SIZE / 2
+        self.speed = BULLET_SPEED_PER_SECOND
+
+        self.pos = np.zeros((0, 2))
+        self.dir = np.zeros((0, 2))
+        self.spawn_time = np.zeros(0)
+        self.active = np.zeros(0, dtype=bool)
+        self.grow(BULLET_SYSTEM_CAPACITY if capacity is None else capacity)
+
+    def active_count(self):
+        """Anzahl der aktiven Projektile"""
+        return int(self.active.sum())
+
+    def spawn(self, x, y, dir_x, dir_y):
+        """Erzeugt ein neues Projektil"""
+        slot = self.allocate_slot()
+
+        self.pos[slot] = x, y
+        self.dir[slot] = dir_x, dir_y
+        self.spawn_time[slot] = self.game.clock.get_ticks()
+        self.active[slot] = True
+
+    def remove(self, slots):
+        """Entfernt Projektile anhand ihrer Slots"""
+        self.active[slots] = False
+        self.free.extend(slots.tolist())
+
+    def clear(self):
+        """Entfernt alle Projektile"""
+        self.remove(np.flatnonzero(self.active))
+
+    def march_walls(self, start, direction, travel):
+        """DDA-Ray-March über das Tile-Gitter.
+
+        Gibt pro Projektil die Strecke bis zum Eintritt in das erste Wand-Tile
+        zurück (inf, falls auf der Strecke keine Wand liegt).
+        """
+        grid = self.game.map.map_data
+        count = len(start)
+        hit = np.full(count, np.inf)
+
+        cell = np.floor(start / TILESIZE).astype(int)
+        step = np.where(direction > 0, 1, -1)
+        with np.errstate(divide='ignore'):
+            inverse = np.where(direction != 0, 1 / np.abs(direction), np.inf)
+
+        # Strecke bis zur nächsten Tile-Grenze pro Achse und Strecke pro Tile
+        boundary = np.where(direction > 0, (cell + 1) * TILESIZE, cell * TILESIZE)
+        with np.errstate(invalid='ignore'):
+            t_max = np.where(direction != 0, np.abs(boundary - start) * inverse, np.inf)
+        t_delta = TILESIZE * inverse
+        t = np.zeros(count)
+
+        marching = np.ones(count, dtype=bool)
+        max_steps = int(travel.max() // TILESIZE) * 2 + 3 if count else 0
+        for _ in range(max_steps):
+            idx = np.flatnonzero(marching)
+            if not idx.size:
+                break
+
+            # Steht im aktuellen Tile eine Wand?
+            in_wall = grid.walls_at(cell[idx, 0], cell[idx, 1])
+            hit[idx[in_wall]] = t[idx[in_wall]]
+            marching[idx[in_wall]] = False
+            idx = idx[~in_wall]
+
+            # Zum nächsten Tile entlang der Achse mit der nächsten Grenze
+            step_x = t_max[idx, 0] < t_max[idx, 1]
+            t_next = np.where(step_x, t_max[idx, 0], t_max[idx, 1])
+            beyond = t_next > travel[idx]
+            marching[idx[beyond]] = False
+
+            idx, step_x, t_next = idx[~beyond], step_x[~beyond], t_next[~beyond]
+            axis = np.where(step_x, 0, 1)
+            cell[idx, axis] += step[idx, axis]
+            t_max[idx, axis] += t_delta[idx, axis]
+            t[idx] = t_next
+
+        return hit
+
+    def segment_hit(self, x, y, dx, dy, length, rect):
+        """Slab-Test: Strecke gegen ein um den Projektilradius vergrößertes Rect.
+
+        Gibt die Strecke bis zum Eintritt zurück oder None, falls kein Treffer.
+        """
+        r = self.radius
+        t_enter, t_exit = 0.0, length
+        for origin, delta, low, high in ((x, dx, rect.left - r, rect.right + r),
+                                         (y, dy, rect.top - r, rect.bottom + r)):
+            if delta == 0:
+                if not low <= origin <= high:
+                    return None
+                continue
+            t1 = (low - origin) / delta
+            t2 = (high - origin) / delta
+            if t1 > t2:
+                t1, t2 = t2, t1
+            t_enter = max(t_enter, t1)
+            t_exit = min(t_exit, t2)
+            if t_enter > t_exit:
+                return None
+        return t_enter
+
+    def update(self, dt, zombie_hash):
+        """Bewegt alle Projektile und gibt die getroffenen Zombies zurück (einer pro Projektil)"""
+        slots = np.flatnonzero(self.active)
+        if not slots.size:
+            return []
+
+        start = self.pos[slots]
+        direction = self.dir[slots]
+        travel = np.full(len(slots), self.speed * dt)
+
+        # Wände begrenzen die Strecke, die ein Projektil in diesem Tick zurücklegen kann
+        wall_hit = self.march_walls(start, direction, travel)
+        reach = np.minimum(travel, wall_hit)
+        end = start + direction * reach[:, None]
+
+        # Zombies entlang der Strecke (Broad Phase über den Spatial Hash)
+        hits = []
+        consumed = wall_hit <= travel
+        r = self.radius
+        rows = zip(start.tolist(), direction.tolist(), end.tolist(), reach.tolist())
+        for i, ((x, y), (dx, dy), (ex, ey), length) in enumerate(rows):
+            bounds = pg.Rect(int(min(x, ex) - r), int(min(y, ey) - r),
+                             int(abs(ex - x) + 2 * r) + 2, int(abs(ey - y) + 2 * r) + 2)
+            best, best_t = None, None
+            for zombie in zombie_hash.query(bounds):
+                t_hit = self.segment_hit(x, y, dx, dy, length, zombie.rect)
+                if t_hit is not None and (best_t is None or t_hit < best_t):
+                    best, best_t = zombie, t_hit
+            if best is not None:
+                hits.append(best)
+                consumed[i] = True
+
+        # Abgelaufene Projektile
+        now = self.game.clock.get_ticks()
+        expired = now - self.spawn_time[slots] > BULLET_LIFETIME
+
+        self.pos[slots] = end
+        self.remove(slots[consumed | expired])
+        return hits
+
+    def blit_sequence(self, offset=(0, 0), cull_rect=None):
+        """Gibt (Bild, Bildschirmposition) der aktiven Projektile für Surface.blits zurück.
+
+        Mit cull_rect nur Projektile, deren Mittelpunkt in diesem Weltbereich liegt.
+        """
+        slots = np.flatnonzero(self.active)
+        if not slots.size:
+            return []
+        positions = self.pos[slots]
+        if cull_rect is not None:
+            inside = ((positions[:, 0] >= cull_rect.left) & (positions[:, 0] < cull_rect.right)
+                      & (positions[:, 1] >= cull_rect.top) & (positions[:, 1] < cull_rect.bottom))
+            positions = positions[inside]
+        positions = positions - np.array(offset) - self.image.get_width() / 2
+        return [(self.image, (x, y)) for x, y in positions.tolist()]
+
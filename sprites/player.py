@@ -1,7 +1,6 @@
 import pygame as pg
 import math
 from settings import *
-from sprites.projectile import Bullet
 
 
 class Player(pg.sprite.Sprite):
@@ -25,47 +24,37 @@ class Player(pg.sprite.Sprite):
         self.max_health = PLAYER_HEALTH
         self.ammo = 50  # Anfangsmunition
         self.last_shot = 0  # Zeitpunkt des letzten Schusses
+        self.damage_taken = 0  # Insgesamt erlittener Schaden (für Auswertungen)
 
         # Power-Up-Status
         self.speed_boost_active = False
         self.speed_boost_timer = 0
 
     def get_keys(self):
-        """Verarbeitet Tastatureingaben für die Bewegung"""
-        self.vel = pg.math.Vector2(0, 0)
-        keys = pg.key.get_pressed()
-
+        """Verarbeitet Bewegungseingaben (Tastatur, Skript oder KI)"""
         # Bewegung in 8 Richtungen
-        if keys[pg.K_LEFT] or keys[pg.K_a]:
-            self.vel.x = -self.speed
-        if keys[pg.K_RIGHT] or keys[pg.K_d]:
-            self.vel.x = self.speed
-        if keys[pg.K_UP] or keys[pg.K_w]:
-            self.vel.y = -self.speed
-        if keys[pg.K_DOWN] or keys[pg.K_s]:
-            self.vel.y = self.speed
+        self.vel = self.game.controls.move * self.speed
 
         # Diagonale Bewegung normalisieren (gleiche Geschwindigkeit in alle Richtungen)
         if self.vel.length() > 0:
             self.vel = self.vel.normalize() * self.speed
 
     def get_mouse(self):
-        """Verarbeitet Mauseingaben für das Schießen"""
-        mouse_buttons = pg.mouse.get_pressed()
-        now = pg.time.get_ticks()
+        """Verarbeitet Schusseingaben (Maus, Skript oder KI)"""
+        now = self.game.clock.get_ticks()
 
         # Linke Maustaste zum Schießen
-        if mouse_buttons[0] and now - self.last_shot > PLAYER_COOLDOWN and self.ammo > 0:
+        if self.game.controls.shooting and now - self.last_shot > PLAYER_COOLDOWN and self.ammo > 0:
             self.shoot()
             self.last_shot = now
             self.ammo -= 1
 
     def shoot(self):
         """Erstellt ein neues Projektil in Richtung Mauszeiger"""
-        # Berechne Richtung zum Mauszeiger
-        mouse_x, mouse_y = pg.mouse.get_pos()
-        dir_x = mouse_x - self.pos.x
-        dir_y = mouse_y - self.pos.y
+        # Berechne Richtung zum Zielpunkt
+        aim = self.game.controls.aim
+        dir_x = aim.x - self.pos.x
+        dir_y = aim.y - self.pos.y
 
         # Normalisiere den Richtungsvektor
         length = math.sqrt(dir_x ** 2 + dir_y ** 2)
@@ -73,8 +62,11 @@ class Player(pg.sprite.Sprite):
             dir_x /= length
             dir_y /= length
 
-        # Erstelle das Projektil
-        Bullet(self.game, self.pos.x, self.pos.y, dir_x, dir_y)
+        # Projektil im Batch-System oder aus dem Pool erzeugen
+        if self.game.bullet_system:
+            self.game.bullet_system.spawn(self.pos.x, self.pos.y, dir_x, dir_y)
+        else:
+            self.game.bullet_pool.acquire(self.pos.x, self.pos.y, dir_x, dir_y)
 
     def update(self):
         """Aktualisiert Position und Status des Spielers"""
@@ -89,12 +81,12 @@ class Player(pg.sprite.Sprite):
         self.rect.centerx = self.pos.x
 
         # Kollisionserkennung X-Achse
-        hits_x = pg.sprite.spritecollide(self, self.game.walls, False)
+        hits_x = self.game.wall_collider.colliding_walls(self.rect)
         if hits_x:
             if self.vel.x > 0:  # Bewegung nach rechts
-                self.pos.x = hits_x[0].rect.left - self.rect.width / 2
+                self.pos.x = hits_x[0].left - self.rect.width / 2
             if self.vel.x < 0:  # Bewegung nach links
-                self.pos.x = hits_x[0].rect.right + self.rect.width / 2
+                self.pos.x = hits_x[0].right + self.rect.width / 2
             self.vel.x = 0
             self.rect.centerx = self.pos.x
 
@@ -103,12 +95,12 @@ class Player(pg.sprite.Sprite):
         self.rect.centery = self.pos.y
 
         # Kollisionserkennung Y-Achse
-        hits_y = pg.sprite.spritecollide(self, self.game.walls, False)
+        hits_y = self.game.wall_collider.colliding_walls(self.rect)
         if hits_y:
             if self.vel.y > 0:  # Bewegung nach unten
-                self.pos.y = hits_y[0].rect.top - self.rect.height / 2
+                self.pos.y = hits_y[0].top - self.rect.height / 2
             if self.vel.y < 0:  # Bewegung nach oben
-                self.pos.y = hits_y[0].rect.bottom + self.rect.height / 2
+                self.pos.y = hits_y[0].bottom + self.rect.height / 2
             self.vel.y = 0
             self.rect.centery = self.pos.y
 
@@ -122,28 +114,28 @@ class Player(pg.sprite.Sprite):
         """Prüft und verhindert Kollisionen mit Wänden"""
         # X-Achse
         self.rect.centerx = self.pos.x
-        hits = pg.sprite.spritecollide(self, self.game.walls, False)
+        hits = self.game.wall_collider.colliding_walls(self.rect)
         if hits:
             if self.vel.x > 0:  # Bewegung nach rechts
-                self.pos.x = hits[0].rect.left - self.rect.width / 2
+                self.pos.x = hits[0].left - self.rect.width / 2
             if self.vel.x < 0:  # Bewegung nach links
-                self.pos.x = hits[0].rect.right + self.rect.width / 2
+                self.pos.x = hits[0].right + self.rect.width / 2
             self.vel.x = 0  # Geschwindigkeit auf der X-Achse stoppen
             self.rect.centerx = self.pos.x
 
         # Y-Achse
         self.rect.centery = self.pos.y
-        hits = pg.sprite.spritecollide(self, self.game.walls, False)
+        hits = self.game.wall_collider.colliding_walls(self.rect)
         if hits:
             if self.vel.y > 0:  # Bewegung nach unten
-                self.pos.y = hits[0].rect.top - self.rect.height / 2
+                self.pos.y = hits[0].top - self.rect.height / 2
             if self.vel.y < 0:  # Bewegung nach oben
-                self.pos.y = hits[0].rect.bottom + self.rect.height / 2
+                self.pos.y = hits[0].bottom + self.rect.height / 2
             self.vel.y = 0  # Geschwindigkeit auf der Y-Achse stoppen
             self.rect.centery = self.pos.y
     def update_powerups(self):
         """Aktualisiert und verwaltet aktive Power-Ups"""
-        now = pg.time.get_ticks()
+        now = self.game.clock.get_ticks()
 
         # Speed-Boost verwalten
         if self.speed_boost_active:
@@ -153,6 +145,7 @@ class Player(pg.sprite.Sprite):
 
     def take_damage(self, amount):
         """Reduziert die Gesundheit des Spielers"""
+        self.damage_taken += min(amount, self.health)
         self.health -= amount
         if self.health < 0:
             self.health = 0
@@ -170,5 +163,5 @@ class Player(pg.sprite.Sprite):
     def apply_speed_boost(self):
         """Aktiviert einen temporären Geschwindigkeits-Boost"""
         self.speed_boost_active = True
-        self.speed_boost_timer = pg.time.get_ticks()
+        self.speed_boost_timer = self.game.clock.get_ticks()
         self.speed = PLAYER_SPEED * SPEED_POWERUP_MULTIPLIER
\ No newline at end of file
@@ -0,0 +1,58 @@
+class SpritePool:
+    """Objekt-Pool für kurzlebige Sprites (Projektile, Power-Ups).
+
+    Die Sprites werden vorab erzeugt und nach kill() wieder in den Pool
+    gelegt. acquire() setzt ein freies Sprite über reset() neu auf und trägt es
+    wieder in seine Gruppen ein. Ist der Pool leer, wird ein neues Sprite
+    erzeugt und als Engpass gezählt.
+    """
+
+    def __init__(self, factory, size):
+        self.factory = factory  # Erzeugt ein neues Sprite: factory(pool)
+        self.free = []
+
+        # Statistik für den Druck auf den Pool
+        self.allocated = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.exhausted = 0
+
+        for _ in range(size):
+            self.allocate().kill()
+
+    def allocate(self):
+        """Erzeugt ein neues Sprite für den Pool"""
+        self.allocated += 1
+        self.in_use += 1
+        return self.factory(self)
+
+    def acquire(self, *args):
+        """Holt ein Sprite aus dem Pool und setzt es mit den Argumenten neu auf"""
+        if self.free:
+            sprite = self.free.pop()
+            self.in_use += 1
+            sprite.add(*sprite.groups)
+            sprite.reset(*args)
+        else:
+            # Pool erschöpft: neues Sprite erzeugen, das danach im Pool bleibt
+            self.exhausted += 1
+            sprite = self.allocate()
+            sprite.reset(*args)
+
+        self.peak_in_use = max(self.peak_in_use, self.in_use)
+        return sprite
+
+    def release(self, sprite):
+        """Legt ein Sprite nach kill() zurück in den Pool"""
+        self.in_use -= 1
+        self.free.append(sprite)
+
+    def stats(self):
+        """Gibt Auslastung und Engpässe des Pools zurück"""
+        return {
+            'allocated': self.allocated,
+            'in_use': self.in_use,
+            'free': len(self.free),
+            'peak_in_use': self.peak_in_use,
+            'exhausted': self.exhausted,
+        }
@@ -6,10 +6,12 @@ from settings import *
 class PowerUp(pg.sprite.Sprite):
     """Basis-Klasse für alle Power-Ups"""
 
-    def __init__(self, game, x, y):
-        self.groups = game.all_sprites, game.powerups
+    def __init__(self, game, x, y, pool=None):
+        # Nicht in all_sprites: animiert werden nur sichtbare Power-Ups (siehe Game.update)
+        self.groups = game.powerups
         pg.sprite.Sprite.__init__(self, self.groups)
         self.game = game
+        self.pool = pool  # SpritePool, in den das Power-Up nach kill() zurückkehrt
 
         # Position
         self.pos = pg.math.Vector2(x, y)
@@ -21,14 +23,28 @@ class PowerUp(pg.sprite.Sprite):
         # Animations-Parameter für visuellen Effekt
         self.bob_range = 5  # Pixel, die das Power-Up auf und ab schwebt
         self.bob_speed = 0.005  # Geschwindigkeit der Schwebebewegung
-        self.spawn_time = pg.time.get_ticks()
+        self.spawn_time = self.game.clock.get_ticks()
 
     def update(self):
         """Aktualisiert das Power-Up (Animation)"""
         # Berechne Y-Offset für schwebenden Effekt
-        offset = math.sin((pg.time.get_ticks() - self.spawn_time) * self.bob_speed) * self.bob_range
+        offset = math.sin((self.game.clock.get_ticks() - self.spawn_time) * self.bob_speed) * self.bob_range
         self.rect.centery = self.pos.y + offset
 
+    def reset(self, x, y):
+        """Setzt das Power-Up bei Wiederverwendung aus dem Pool an eine neue Position"""
+        self.pos.update(x, y)
+        self.rect.center = (x, y)
+        self.spawn_time = self.game.clock.get_ticks()
+
+    def kill(self):
+        """Entfernt das Power-Up aus allen Gruppen und gibt es an den Pool zurück"""
+        if not self.alive():
+            return
+        super().kill()
+        if self.pool:
+            self.pool.release(self)
+
     def apply(self, player):
         """Wendet den Power-Up-Effekt auf den Spieler an"""
         pass  # In Unterklassen überschrieben
@@ -37,8 +53,8 @@ class PowerUp(pg.sprite.Sprite):
 class HealthPowerup(PowerUp):
     """Stellt Gesundheit wieder her"""
 
-    def __init__(self, game, x, y):
-        super().__init__(game, x, y)
+    def __init__(self, game, x, y, pool=None):
+        super().__init__(game, x, y, pool)
 
         # Bild und Rect
         self.image = game.health_powerup_img
@@ -53,8 +69,8 @@ class HealthPowerup(PowerUp):
 class AmmoPowerup(PowerUp):
     """Fügt Munition hinzu"""
 
-    def __init__(self, game, x, y):
-        super().__init__(game, x, y)
+    def __init__(self, game, x, y, pool=None):
+        super().__init__(game, x, y, pool)
 
         # Bild und Rect
         self.image = game.ammo_powerup_img
@@ -69,8 +85,8 @@ class AmmoPowerup(PowerUp):
 class SpeedPowerup(PowerUp):
     """Temporärer Geschwindigkeits-Boost"""
 
-    def __init__(self, game, x, y):
-        super().__init__(game, x, y)
+    def __init__(self, game, x, y, pool=None):
+        super().__init__(game, x, y, pool)
 
         # Bild und Rect
         self.image = game.speed_powerup_img
@@ -3,23 +3,31 @@ from settings import *
 
 
 class Bullet(pg.sprite.Sprite):
-    def __init__(self, game, x, y, dir_x, dir_y):
+    def __init__(self, game, x, y, dir_x, dir_y, pool=None):
         self.groups = game.all_sprites, game.bullets
         pg.sprite.Sprite.__init__(self, self.groups)
         self.game = game
+        self.pool = pool  # SpritePool, in den das Projektil nach kill() zurückkehrt
 
         # Bild und Rect
         self.image = game.bullet_img
         self.rect = self.image.get_rect()
-        self.rect.center = (x, y)
 
         # Position und Bewegung
-        self.pos = pg.math.Vector2(x, y)
-        self.dir = pg.math.Vector2(dir_x, dir_y)
+        self.pos = pg.math.Vector2(0, 0)
+        self.dir = pg.math.Vector2(0, 0)
         self.speed = BULLET_SPEED
 
+        self.reset(x, y, dir_x, dir_y)
+
+    def reset(self, x, y, dir_x, dir_y):
+        """Setzt Position, Richtung und Lebensdauer (auch bei Wiederverwendung aus dem Pool)"""
+        self.rect.center = (x, y)
+        self.pos.update(x, y)
+        self.dir.update(dir_x, dir_y)
+
         # Lebensdauer des Projektils
-        self.spawn_time = pg.time.get_ticks()
+        self.spawn_time = self.game.clock.get_ticks()
 
     def update(self):
         """Aktualisiert Position und prüft Lebensdauer"""
@@ -28,10 +36,18 @@ class Bullet(pg.sprite.Sprite):
         self.rect.center = self.pos
 
         # Entferne Projektil, wenn es zu lange existiert oder mit Wänden kollidiert
-        now = pg.time.get_ticks()
+        now = self.game.clock.get_ticks()
         if now - self.spawn_time > BULLET_LIFETIME:
             self.kill()
 
         # Prüfen auf Kollision mit Wänden
-        if pg.sprite.spritecollideany(self, self.game.walls):
-            self.kill()
\ No newline at end of file
+        if self.game.wall_collider.collides(self.rect):
+            self.kill()
+
+    def kill(self):
+        """Entfernt das Projektil aus allen Gruppen und gibt es an den Pool zurück"""
+        if not self.alive():
+            return
+        super().kill()
+        if self.pool:
+            self.pool.release(self)
@@ -0,0 +1,39 @@
+try:
+    import numpy as np
+except ImportError:  # numpy ist nur für die Batch-Systeme nötig
+    np = None
+
+
+class SlotArrays:
+    """Basis der NumPy-Batch-Systeme: jedes Objekt belegt einen Slot in parallelen Arrays.
+
+    Unterklassen nennen in ARRAYS die Attribute ihrer Arrays (erste Achse =
+    Slot). grow() verlängert alle um mit Null gefüllte Slots, allocate_slot()
+    vergibt den kleinsten freien Slot und verdoppelt bei Bedarf die Kapazität.
+    """
+
+    ARRAYS = ()
+
+    def __init__(self):
+        self.capacity = 0
+        self.free = []
+
+    def grow(self, capacity):
+        """Vergrößert alle Arrays auf die neue Kapazität"""
+        extra = capacity - self.capacity
+        if extra <= 0:
+            return
+
+        for name in self.ARRAYS:
+            array = getattr(self, name)
+            setattr(self, name, np.concatenate([array, np.zeros((extra,) + array.shape[1:], dtype=array.dtype)]))
+
+        # Freie Slots absteigend, damit pop() die kleinsten Indizes zuerst vergibt
+        self.free = list(range(capacity - 1, self.capacity - 1, -1)) + self.free
+        self.capacity = capacity
+
+    def allocate_slot(self):
+        """Vergibt einen freien Slot, wächst auf die doppelte Kapazität, wenn keiner frei ist"""
+        if not self.free:
+            self.grow(max(self.capacity * 2, 1))
+        return self.free.pop()
@@ -1,6 +1,7 @@
 import pygame as pg
-import random
 from settings import *
+from sprites.powerup import HealthPowerup, AmmoPowerup, SpeedPowerup
+from sprites.ai_scheduler import LOD_FAR
 
 
 class Zombie(pg.sprite.Sprite):
@@ -15,10 +16,25 @@ class Zombie(pg.sprite.Sprite):
         self.pos = pg.math.Vector2(x, y)
         self.vel = pg.math.Vector2(0, 0)
 
+        # Slot in der ZombieSwarm-Batch-Simulation (nur bei BATCHED_ZOMBIES)
+        self.swarm_slot = None
+
+        # A*-Pfad (nur bei ZOMBIE_NAVIGATION 'astar' oder 'hpa')
+        self.path = []
+        self.path_index = 0
+        self.path_goal = None
+
+        # Detailstufe der KI, wird vom AIScheduler jeden Tick gesetzt (ohne Scheduler: immer denken)
+        self.lod = 0
+        self.think_now = True
+        self.think_phase = None  # Feste Round-Robin-Phase, vergibt der Scheduler
+        self.force_think = False  # Im nächsten Tick denken, z.B. nach Blockade durch eine Wand
+
         # Attribute werden in Unterklassen gesetzt
         self.speed = 0
         self.health = 0
         self.damage = 0
+        self.think_intervals = (1, 1, 1)  # Denkintervall in Ticks pro Detailstufe (nah, mittel, fern)
 
         # Bild und Rect werden in Unterklassen gesetzt
         self.image = None
@@ -26,16 +42,19 @@ class Zombie(pg.sprite.Sprite):
 
     def update(self):
         """Aktualisiert Position und Zustand des Zombies"""
-        # Richtung zum Spieler berechnen
-        target = self.game.player.pos
-        self.vel = target - self.pos
+        # Im Batch-Modus bewegt der ZombieSwarm alle Zombies gemeinsam
+        if self.swarm_slot is not None:
+            return
+
+        # Richtung neu bestimmen, sonst mit der zuletzt berechneten Geschwindigkeit weiter
+        if self.think_now:
+            self.think()
 
-        # Normalisieren und Geschwindigkeit anwenden
-        if self.vel.length() > 0:
-            self.vel = self.vel.normalize() * self.speed
+        # Ferne Zombies: nur Bewegung und eine einfache Wandprüfung, an Wänden wie alle anderen
+        if self.lod == LOD_FAR and self.move_cheap():
+            return
 
         # Position aktualisieren
-        old_pos = self.pos.copy()  # Position für Kollisionsprüfung merken
         self.pos += self.vel * self.game.dt
 
         # X und Y separat aktualisieren für korrekte Kollisionserkennung
@@ -48,55 +67,138 @@ class Zombie(pg.sprite.Sprite):
         # Rect mit endgültiger Position aktualisieren
         self.rect.center = self.pos
 
+    def think(self):
+        """Berechnet die Geschwindigkeit aus Navigation und Schwarmkräften"""
+        # Richtung aus Flow Field oder A*-Pfad bestimmen
+        direction = self.navigate()
+        if direction is not None:
+            self.vel = direction * self.speed
+        else:
+            # Außerhalb der Karte, unerreichbar oder im Tile des Spielers: direkt zum Spieler
+            target = self.game.player.pos
+            self.vel = target - self.pos
+
+            # Normalisieren und Geschwindigkeit anwenden
+            if self.vel.length() > 0:
+                self.vel = self.vel.normalize() * self.speed
+
+        # Schwarmkräfte: Abstand zu Nachbarn, gemeinsame Laufrichtung, Wände meiden
+        if self.game.crowd:
+            self.vel = self.game.crowd.steer(self, self.vel)
+
+    def move_cheap(self):
+        """Bewegt den Zombie ohne Wandauflösung.
+
+        Berührt er danach eine Wand, wird der Schritt zurückgenommen, der
+        Zombie denkt im nächsten Tick neu und es wird False zurückgegeben.
+        """
+        step = self.vel * self.game.dt
+        self.pos += step
+        self.rect.center = self.pos
+        if self.game.wall_collider.collides(self.rect):
+            self.pos -= step
+            self.rect.center = self.pos
+            self.force_think = True
+            return False
+        return True
+
+    def navigate(self):
+        """Gibt die Laufrichtung zum Spieler zurück (None = direkt auf den Spieler zusteuern)"""
+        if ZOMBIE_NAVIGATION in ('astar', 'hpa'):
+            return self.follow_path()
+        return self.game.flow_field.direction_at(self.pos)
+
+    def follow_path(self):
+        """Folgt dem A*-Pfad und fordert bei einem neuen Ziel-Tile einen neuen an"""
+        player_pos = self.game.player.pos
+        goal = (int(player_pos.x // TILESIZE), int(player_pos.y // TILESIZE))
+
+        # Neuen Pfad anfordern; bis er eintrifft, wird der alte weiterverfolgt
+        path_queue = self.game.path_queue
+        if goal != self.path_goal and not path_queue.is_pending(self):
+            self.path_goal = goal
+            path_queue.request(self, (self.pos.x, self.pos.y), (player_pos.x, player_pos.y))
+
+        # Erreichte Wegpunkte überspringen
+        while self.path_index < len(self.path):
+            waypoint = self.path[self.path_index]
+            direction = pg.math.Vector2(waypoint[0] - self.pos.x, waypoint[1] - self.pos.y)
+            if direction.length_squared() > (TILESIZE / 4) ** 2:
+                return direction.normalize()
+            self.path_index += 1
+
+        return None
+
+    def on_path_found(self, path):
+        """Wird von der PathRequestQueue aufgerufen, sobald der Pfad berechnet ist"""
+        self.path = path
+        # Der erste Wegpunkt ist das Tile, auf dem der Zombie bei der Anfrage stand
+        self.path_index = 1 if len(path) > 1 else 0
+
     def take_damage(self, amount):
         """Reduziert die Gesundheit des Zombies"""
-        self.health -= amount
+        if self.swarm_slot is not None:
+            # Im Batch-Modus wird die Gesundheit im Array des Schwarms geführt
+            self.health = self.game.zombie_swarm.take_damage(self, amount)
+        else:
+            self.health -= amount
         if self.health <= 0:
             self.die()
 
+    def kill(self):
+        """Entfernt den Zombie aus allen Gruppen, gibt seinen Slot im Schwarm frei und verwirft Pfadanfragen"""
+        if self.swarm_slot is not None:
+            self.game.zombie_swarm.remove(self)
+        self.game.path_queue.cancel(self)
+        super().kill()
+
     def die(self):
         """Entfernt den Zombie und spawnt möglicherweise ein Power-Up"""
         # Mit geringer Wahrscheinlichkeit ein Power-Up droppen
-        if random.random() < 0.2:  # 20% Chance
+        if self.game.rng.random() < 0.2:  # 20% Chance
             self.drop_powerup()
 
         self.kill()
 
     def drop_powerup(self):
         """Spawnt ein zufälliges Power-Up an der Position des Zombies"""
-        rand = random.random()
+        rand = self.game.rng.random()
         if rand < 0.4:  # 40% Chance für Health
-            from sprites.powerup import HealthPowerup
-            HealthPowerup(self.game, self.pos.x, self.pos.y)
+            powerup_class = HealthPowerup
         elif rand < 0.8:  # 40% Chance für Ammo
-            from sprites.powerup import AmmoPowerup
-            AmmoPowerup(self.game, self.pos.x, self.pos.y)
+            powerup_class = AmmoPowerup
         else:  # 20% Chance für Speed
-            from sprites.powerup import SpeedPowerup
-            SpeedPowerup(self.game, self.pos.x, self.pos.y)
+            powerup_class = SpeedPowerup
+        self.game.powerup_pools[powerup_class].acquire(self.pos.x, self.pos.y)
 
     def collide_with_walls(self, dir):
         """Prüft und verhindert Kollisionen mit Wänden"""
         if dir == 'x':
-            hits = pg.sprite.spritecollide(self, self.game.walls, False)
+            hits = self.game.wall_collider.colliding_walls(self.rect)
             if hits:
+                self.hit_walls(hits)
                 if self.vel.x > 0:  # Bewegung nach rechts
-                    self.pos.x = hits[0].rect.left - self.rect.width / 2
+                    self.pos.x = hits[0].left - self.rect.width / 2
                 if self.vel.x < 0:  # Bewegung nach links
-                    self.pos.x = hits[0].rect.right + self.rect.width / 2
+                    self.pos.x = hits[0].right + self.rect.width / 2
                 self.vel.x = 0
                 self.rect.centerx = self.pos.x
 
         if dir == 'y':
-            hits = pg.sprite.spritecollide(self, self.game.walls, False)
+            hits = self.game.wall_collider.colliding_walls(self.rect)
             if hits:
+                self.hit_walls(hits)
                 if self.vel.y > 0:  # Bewegung nach unten
-                    self.pos.y = hits[0].rect.top - self.rect.height / 2
+                    self.pos.y = hits[0].top - self.rect.height / 2
                 if self.vel.y < 0:  # Bewegung nach oben
-                    self.pos.y = hits[0].rect.bottom + self.rect.height / 2
+                    self.pos.y = hits[0].bottom + self.rect.height / 2
                 self.vel.y = 0
                 self.rect.centery = self.pos.y
 
+    def hit_walls(self, hits):
+        """Wird aufgerufen, wenn der Zombie gegen Wände läuft (Rects der Wand-Tiles)"""
+        pass  # In Unterklassen überschrieben
+
 
 class NormalZombie(Zombie):
     """Standard-Zombie mit durchschnittlichen Werten"""
@@ -108,6 +210,7 @@ class NormalZombie(Zombie):
         self.speed = ZOMBIE_NORMAL_SPEED
         self.health = ZOMBIE_NORMAL_HEALTH
         self.damage = ZOMBIE_NORMAL_DAMAGE
+        self.think_intervals = ZOMBIE_NORMAL_THINK_INTERVALS
 
         # Bild und Rect
         self.image = game.zombie_normal_img
@@ -125,6 +228,7 @@ class FastZombie(Zombie):
         self.speed = ZOMBIE_FAST_SPEED
         self.health = ZOMBIE_FAST_HEALTH
         self.damage = ZOMBIE_FAST_DAMAGE
+        self.think_intervals = ZOMBIE_FAST_THINK_INTERVALS
 
         # Bild und Rect
         self.image = game.zombie_fast_img
@@ -142,6 +246,7 @@ class StrongZombie(Zombie):
         self.speed = ZOMBIE_STRONG_SPEED
         self.health = ZOMBIE_STRONG_HEALTH
         self.damage = ZOMBIE_STRONG_DAMAGE
+        self.think_intervals = ZOMBIE_STRONG_THINK_INTERVALS
 
         # Bild und Rect
         self.image = game.zombie_strong_img
@@ -150,4 +255,21 @@ class StrongZombie(Zombie):
 
         # Zusätzliche Attribute für den starken Zombie
         self.can_destroy_walls = True
-        self.wall_cooldown = 0
\ No newline at end of file
+        self.wall_cooldown = 0
+
+    def hit_walls(self, hits):
+        """Zerstört eine Wand, gegen die der Zombie läuft (höchstens eine pro ZOMBIE_WALL_BREAK_COOLDOWN)"""
+        if not self.can_destroy_walls:
+            return
+        now = self.game.clock.get_ticks()
+        if now < self.wall_cooldown:
+            return
+
+        # Erste Wand, die kein Kartenrand ist
+        game_map = self.game.map
+        for rect in hits:
+            x, y = rect.x // TILESIZE, rect.y // TILESIZE
+            if not game_map.is_border(x, y):
+                game_map.set_tile(x, y, 0)
+                self.wall_cooldown = now + ZOMBIE_WALL_BREAK_COOLDOWN
+                return
\ No newline at end of file
@@ -0,0 +1,192 @@
+from settings import *
+from sprites.slot_arrays import SlotArrays
+
+try:
+    import numpy as np
+except ImportError:  # numpy ist nur für BATCHED_ZOMBIES nötig
+    np = None
+
+
+class ZombieSwarm(SlotArrays):
+    """Batch-Simulation aller Zombies als Structure of Arrays mit NumPy.
+
+    Positionen, Geschwindigkeiten, Tempo, Gesundheit und Schaden liegen in
+    zusammenhängenden Arrays. Bewegung und Wandkollision werden für alle
+    Zombies in einem vektorisierten Schritt berechnet; die Sprites dienen nur
+    noch als Sicht für Rendering und Treffer und bekommen ihr Rect am Ende
+    des Schritts zurückgeschrieben.
+    """
+
+    ARRAYS = ('pos', 'vel', 'speed', 'health', 'damage', 'half_size', 'active')
+
+    def __init__(self, game, capacity=None):
+        if np is None:
+            raise ImportError("BATCHED_ZOMBIES benötigt numpy")
+
+        super().__init__()
+        self.game = game
+        self.sprites = []
+
+        self.pos = np.zeros((0, 2))
+        self.vel = np.zeros((0, 2))
+        self.speed = np.zeros(0)
+        self.health = np.zeros(0)
+        self.damage = np.zeros(0)
+        self.half_size = np.zeros((0, 2))
+        self.active = np.zeros(0, dtype=bool)
+        self.grow(ZOMBIE_SWARM_CAPACITY if capacity is None else capacity)
+
+        # Flow Field als Array der Ziel-Mittelpunkte pro Tile
+        self.flow_targets = None
+        self.flow_touched = []  # Zuletzt geschriebene Indizes
+        self.flow_version = None
+
+    def grow(self, capacity):
+        """Vergrößert die Arrays und die Sprite-Liste auf die neue Kapazität"""
+        self.sprites.extend([None] * max(capacity - self.capacity, 0))
+        super().grow(capacity)
+
+    def add(self, zombie):
+        """Übernimmt einen Zombie in die Arrays"""
+        slot = self.allocate_slot()
+
+        self.pos[slot] = zombie.pos.x, zombie.pos.y
+        self.vel[slot] = 0, 0
+        self.speed[slot] = zombie.speed
+        self.health[slot] = zombie.health
+        self.damage[slot] = zombie.damage
+        self.half_size[slot] = zombie.rect.width / 2, zombie.rect.height / 2
+        self.active[slot] = True
+        self.sprites[slot] = zombie
+
+        zombie.swarm_slot = slot
+
+    def remove(self, zombie):
+        """Entfernt einen Zombie aus den Arrays und schreibt seinen Zustand zurück"""
+        slot = zombie.swarm_slot
+        if slot is None:
+            return
+
+        zombie.swarm_slot = None
+        zombie.pos.update(*self.pos[slot])
+        zombie.health = float(self.health[slot])
+
+        self.active[slot] = False
+        self.sprites[slot] = None
+        self.free.append(slot)
+
+    def update_flow_targets(self):
+        """Übernimmt das Flow Field als Array (NaN für Tiles ohne Richtung).
+
+        Nur die Tiles der letzten und der aktuellen Berechnung werden geschrieben,
+        nicht das ganze Array.
+        """
+        flow_field = self.game.flow_field
+        if self.flow_version == flow_field.version:
+            return
+
+        targets = self.flow_targets
+        if targets is None or len(targets) != len(flow_field.next_tiles):
+            targets = self.flow_targets = np.full((len(flow_field.next_tiles), 2), np.nan)
+        else:
+            targets[self.flow_touched] = np.nan
+
+        next_tiles = flow_field.next_tiles
+        touched = [index for index in flow_field.touched if next_tiles[index] is not None]
+        if touched:
+            targets[touched] = np.array([next_tiles[index] for index in touched]) * TILESIZE + TILESIZE / 2
+        self.flow_touched = touched
+        self.flow_version = flow_field.version
+
+    def steering_targets(self, pos):
+        """Zielpunkte aller Zombies: nächstes Tile im Flow Field oder direkt der Spieler"""
+        player = self.game.player.pos
+        targets = np.empty_like(pos)
+        targets[:] = player.x, player.y
+
+        if ZOMBIE_NAVIGATION != 'flowfield':
+            return targets
+
+        self.update_flow_targets()
+        flow_field = self.game.flow_field
+        cols = np.floor(pos[:, 0] / TILESIZE).astype(int)
+        rows = np.floor(pos[:, 1] / TILESIZE).astype(int)
+        inside = (cols >= 0) & (cols < flow_field.width) & (rows >= 0) & (rows < flow_field.height)
+        flow = self.flow_targets[rows[inside] * flow_field.width + cols[inside]]
+        has_flow = ~np.isnan(flow[:, 0])
+
+        selected = targets[inside]
+        selected[has_flow] = flow[has_flow]
+        targets[inside] = selected
+        return targets
+
+    def resolve_axis(self, pos, vel, half, axis):
+        """Schiebt Zombies, die sich entlang einer Achse in eine Wand bewegt haben, zurück"""
+        other = 1 - axis
+
+        # Wie beim Sprite-Rect auf ganze Pixel runden
+        center = np.round(pos)
+
+        # Tiles an der führenden Kante der Bewegung
+        moving_forward = vel[:, axis] > 0
+        edge = np.where(moving_forward, center[:, axis] + half[:, axis] - 1, center[:, axis] - half[:, axis])
+        edge_tile = np.floor(edge / TILESIZE).astype(int)
+
+        # Alle Tiles, die das Rect quer zur Bewegung überdeckt (höchstens 3 bei Zombies bis 64 px)
+        first = np.floor((center[:, other] - half[:, other]) / TILESIZE).astype(int)
+        last = np.floor((center[:, other] + half[:, other] - 1) / TILESIZE).astype(int)
+        grid = self.game.map.map_data
+        hit = np.zeros(len(pos), dtype=bool)
+        for offset in range(3):
+            cross = first + offset
+            in_range = cross <= last
+            if axis == 0:
+                hit |= in_range & grid.walls_at(edge_tile, cross)
+            else:
+                hit |= in_range & grid.walls_at(cross, edge_tile)
+
+        hit &= vel[:, axis] != 0
+        if hit.any():
+            # Rechts/unten: an die Vorderkante der Wand, links/oben: an ihre Rückkante
+            snapped = np.where(moving_forward, edge_tile * TILESIZE - half[:, axis],
+                               (edge_tile + 1) * TILESIZE + half[:, axis])
+            pos[hit, axis] = snapped[hit]
+            vel[hit, axis] = 0
+
+    def update(self, dt):
+        """Bewegt alle Zombies in einem vektorisierten Schritt"""
+        slots = np.flatnonzero(self.active)
+        if not slots.size:
+            return
+
+        pos = self.pos[slots]
+        speed = self.speed[slots]
+        half = self.half_size[slots]
+
+        # Richtung zum Ziel normalisieren und Geschwindigkeit anwenden
+        delta = self.steering_targets(pos) - pos
+        length = np.hypot(delta[:, 0], delta[:, 1])
+        moving = length > 0
+        vel = np.zeros_like(pos)
+        vel[moving] = delta[moving] / length[moving, None] * speed[moving, None]
+
+        # X und Y separat aktualisieren für korrekte Kollisionserkennung
+        pos[:, 0] += vel[:, 0] * dt
+        self.resolve_axis(pos, vel, half, 0)
+        pos[:, 1] += vel[:, 1] * dt
+        self.resolve_axis(pos, vel, half, 1)
+
+        self.pos[slots] = pos
+        self.vel[slots] = vel
+
+        # Sprites als Sicht für Rendering und Treffer aktualisieren
+        sprites = self.sprites
+        for slot, x, y in zip(slots.tolist(), pos[:, 0].tolist(), pos[:, 1].tolist()):
+            sprite = sprites[slot]
+            sprite.pos.update(x, y)
+            sprite.rect.center = (x, y)
+
+    def take_damage(self, zombie, amount):
+        """Reduziert die Gesundheit eines Zombies im Array und gibt den neuen Wert zurück"""
+        self.health[zombie.swarm_slot] -= amount
+        return self.health[zombie.swarm_slot]
@@ -1,5 +1,6 @@
 import pygame as pg
 from settings import *
+from ui.text_cache import TextCache
 
 
 class HUD:
@@ -9,13 +10,30 @@ class HUD:
         self.game = game
         self.font = pg.font.Font(None, 28)
         self.large_font = pg.font.Font(None, 48)
+        self.small_font = pg.font.Font(None, 20)
+
+        # Gerenderte Texte werden nur bei geänderten Werten neu erzeugt
+        self.text_cache = TextCache()
+
+        # Halbtransparente Hintergründe werden einmal erzeugt und wiederverwendet
+        self.transition_background = pg.Surface((SCREEN_WIDTH, 80), pg.SRCALPHA)
+        self.transition_background.fill((0, 0, 0, 128))
+        self.profiler_background = None
+
+    def render_text(self, font, text, color):
+        """Rendert einen Text über den Cache"""
+        return self.text_cache.render(font, text, color)
 
     def draw(self):
-        """Zeichnet alle HUD-Elemente"""
-        self.draw_health_bar()
-        self.draw_ammo_counter()
-        self.draw_wave_info()
-        self.draw_wave_transition()
+        """Zeichnet alle HUD-Elemente und gibt die veränderten Bereiche zurück"""
+        rects = []
+        rects.extend(self.draw_health_bar())
+        rects.extend(self.draw_ammo_counter())
+        rects.extend(self.draw_wave_info())
+        if self.game.show_profiler:
+            rects.extend(self.draw_profiler())
+        rects.extend(self.draw_wave_transition())
+        return rects
 
     def draw_health_bar(self):
         """Zeichnet die Gesundheitsleiste des Spielers"""
@@ -23,7 +41,7 @@ class HUD:
         health_bar_width = 200
         health_bar_height = 20
         outline_rect = pg.Rect(10, 10, health_bar_width, health_bar_height)
-        pg.draw.rect(self.game.screen, BLACK, outline_rect)
+        rects = [pg.draw.rect(self.game.screen, BLACK, outline_rect)]
 
         # Berechne aktuelle Gesundheit als Prozentsatz
         health_percent = self.game.player.health / self.game.player.max_health
@@ -43,50 +61,85 @@ class HUD:
 
         # Text für Gesundheit
         health_text = f"Health: {self.game.player.health}/{self.game.player.max_health}"
-        text_surface = self.font.render(health_text, True, WHITE)
+        text_surface = self.render_text(self.font, health_text, WHITE)
         text_rect = text_surface.get_rect(center=(110, 20))
-        self.game.screen.blit(text_surface, text_rect)
+        rects.append(self.game.screen.blit(text_surface, text_rect))
+        return rects
 
     def draw_ammo_counter(self):
         """Zeichnet den Munitionszähler"""
         ammo_text = f"Ammo: {self.game.player.ammo}"
-        text_surface = self.font.render(ammo_text, True, WHITE)
-        self.game.screen.blit(text_surface, (10, 40))
+        text_surface = self.render_text(self.font, ammo_text, WHITE)
+        return [self.game.screen.blit(text_surface, (10, 40))]
 
     def draw_wave_info(self):
         """Zeichnet die Welleninformation"""
         wave_text = f"Wave: {self.game.wave_manager.current_wave}"
-        text_surface = self.font.render(wave_text, True, WHITE)
+        text_surface = self.render_text(self.font, wave_text, WHITE)
         text_rect = text_surface.get_rect(topright=(SCREEN_WIDTH - 10, 10))
-        self.game.screen.blit(text_surface, text_rect)
+        rects = [self.game.screen.blit(text_surface, text_rect)]
 
-        # Anzahl der verbleibenden Zombies anzeigen
-        zombies_text = f"Zombies: {len(self.game.zombies)}"
-        text_surface = self.font.render(zombies_text, True, WHITE)
+        # Anzahl der verbleibenden Zombies anzeigen (lebende und noch nicht gespawnte)
+        zombies_text = f"Zombies: {len(self.game.zombies) + len(self.game.wave_manager.spawn_queue)}"
+        text_surface = self.render_text(self.font, zombies_text, WHITE)
         text_rect = text_surface.get_rect(topright=(SCREEN_WIDTH - 10, 40))
-        self.game.screen.blit(text_surface, text_rect)
+        rects.append(self.game.screen.blit(text_surface, text_rect))
+        return rects
+
+    def draw_profiler(self):
+        """Zeichnet die gleitenden Frame-Zeiten (p50/p95/p99 in ms) unter der Welleninformation"""
+        summary = self.game.profiler.summary()
+        line_height = 16
+        width = 250
+        left = SCREEN_WIDTH - width - 10
+        top = 70
+
+        # Halbtransparenter Hintergrund, neu erzeugt nur wenn Abschnitte hinzukommen
+        height = (len(summary) + 1) * line_height + 8
+        if self.profiler_background is None or self.profiler_background.get_height() != height:
+            self.profiler_background = pg.Surface((width, height), pg.SRCALPHA)
+            self.profiler_background.fill((0, 0, 0, 160))
+        rects = [self.game.screen.blit(self.profiler_background, (left, top))]
+
+        # Kopfzeile und eine Zeile pro Abschnitt; Spalten rechtsbündig
+        # Abschnitte, deren p95 das Frame-Budget überschreitet, werden rot
+        budget = 1000 / FPS
+        rows = [("ms", ("p50", "p95", "p99"), WHITE)]
+        for name, values in summary.items():
+            columns = tuple(f"{values[key]:.2f}" for key in ('p50', 'p95', 'p99'))
+            rows.append((name, columns, RED if values['p95'] > budget else WHITE))
+
+        for index, (name, columns, color) in enumerate(rows):
+            y = top + 4 + index * line_height
+            self.game.screen.blit(self.render_text(self.small_font, name, color), (left + 4, y))
+            for column, text in enumerate(columns):
+                # Messwerte ändern sich fast jeden Frame und würden nur den Cache verdrängen
+                text_surface = self.small_font.render(text, True, color)
+                self.game.screen.blit(text_surface, text_surface.get_rect(topright=(left + 150 + column * 48, y)))
+        return rects
 
     def draw_wave_transition(self):
         """Zeigt eine Nachricht beim Übergang zwischen Wellen an"""
+        rects = []
         # Nur anzeigen, wenn zwischen den Wellen
         if self.game.wave_manager.wave_completed and not self.game.game_over:
-            now = pg.time.get_ticks()
+            now = self.game.clock.get_ticks()
             time_left = (WAVE_COOLDOWN - (now - self.game.wave_manager.wave_cooldown_timer)) // 1000
 
             if time_left >= 0:
                 # Halbtransparenter Hintergrund
-                s = pg.Surface((SCREEN_WIDTH, 80), pg.SRCALPHA)
-                s.fill((0, 0, 0, 128))
-                self.game.screen.blit(s, (0, SCREEN_HEIGHT // 2 - 40))
+                rects.append(self.game.screen.blit(self.transition_background, (0, SCREEN_HEIGHT // 2 - 40)))
 
                 # Wave-Text
                 wave_text = f"Wave {self.game.wave_manager.current_wave} completed!"
-                text_surface = self.large_font.render(wave_text, True, WHITE)
+                text_surface = self.render_text(self.large_font, wave_text, WHITE)
                 text_rect = text_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 20))
                 self.game.screen.blit(text_surface, text_rect)
 
                 # Countdown-Text
                 next_wave_text = f"Next wave in {time_left + 1}..."
-                text_surface = self.font.render(next_wave_text, True, WHITE)
+                text_surface = self.render_text(self.font, next_wave_text, WHITE)
                 text_rect = text_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 20))
-                self.game.screen.blit(text_surface, text_rect)
\ No newline at end of file
+                self.game.screen.blit(text_surface, text_rect)
+
+        return rects
\ No newline at end of file
@@ -0,0 +1,81 @@
+import pygame as pg
+from settings import *
+
+
+class DirtyRectRenderer:
+    """Zeichnet nur die Bildschirmbereiche neu, die sich seit dem letzten Frame verändert haben"""
+
+    def __init__(self, game):
+        self.game = game
+        # Bereiche, die im letzten Frame bemalt wurden und jetzt wiederhergestellt werden müssen
+        self.last_rects = []
+        self.full_redraw = True
+        self.background_version = None
+        # Zustand des Overlays (Pause / Game Over) im letzten Frame
+        self.overlay_state = None
+        # Seit dem letzten Frame geänderte Tiles (Weltkoordinaten), siehe Map.set_tile
+        self.changed_tiles = []
+
+    def on_tile_changed(self, x, y, value):
+        """Listener von Map.set_tile: das Tile wird im nächsten Frame neu übertragen"""
+        self.changed_tiles.append(pg.Rect(x * TILESIZE, y * TILESIZE, TILESIZE, TILESIZE))
+
+    def draw(self):
+        """Rendert den Frame und überträgt nur die veränderten Bereiche"""
+        game = self.game
+        screen = game.screen
+        background = game.map.get_background(game.camera.offset)
+
+        # Hintergrund hat sich geändert: nach einzelnen Tile-Änderungen bei gleicher
+        # Kameraposition nur diese Tiles, sonst (z.B. Kamerabewegung) alles neu zeichnen
+        restore = self.last_rects
+        if game.map.background_version != self.background_version:
+            ox, oy = game.camera.offset
+            if (self.changed_tiles and self.background_version is not None
+                    and self.background_version[1] == (ox, oy)):
+                restore = restore + [rect.move(-ox, -oy) for rect in self.changed_tiles]
+            else:
+                self.full_redraw = True
+            self.background_version = game.map.background_version
+        self.changed_tiles.clear()
+
+        # Pause- und Game-Over-Bildschirm sind statisch: nur beim Wechsel einmal zeichnen
+        overlay_state = 'paused' if game.paused else 'game_over' if game.game_over else None
+        if overlay_state != self.overlay_state:
+            self.overlay_state = overlay_state
+            self.full_redraw = True
+        elif overlay_state is not None and not self.full_redraw:
+            return
+
+        profiler = game.profiler
+        with profiler.section('map_draw'):
+            if self.full_redraw:
+                screen.blit(background, (0, 0))
+            else:
+                # Alte Positionen mit dem Hintergrund übermalen
+                screen.blits([(background, rect, rect) for rect in restore], False)
+
+        # Alle Sprites zeichnen und betroffene Bereiche merken
+        with profiler.section('sprites_draw'):
+            rects = game.draw_sprites()
+
+        # HUD zeichnen
+        with profiler.section('hud_draw'):
+            rects.extend(game.hud.draw())
+
+        # Pause- oder Game-Over-Bildschirm anzeigen
+        if game.paused:
+            game.draw_pause_screen()
+        elif game.game_over:
+            game.draw_game_over_screen()
+
+        # Ohne Fenster gibt es kein Display zum Aktualisieren
+        if not game.headless:
+            with profiler.section('flip'):
+                if self.full_redraw:
+                    pg.display.flip()
+                else:
+                    pg.display.update(restore + rects)
+        self.full_redraw = False
+
+        self.last_rects = rects
@@ -0,0 +1,49 @@
+from collections import OrderedDict
+from settings import *
+
+
+class TextCache:
+    """LRU-Cache für gerenderte Texte, Schlüssel (Font, Text, Farbe).
+
+    Ein Label wird nur neu gerendert, wenn sich sein Text ändert; häufig
+    wechselnde Werte (Gesundheit, Munition, Countdown) bleiben im Cache, bis
+    sie von neueren Einträgen verdrängt werden.
+    """
+
+    def __init__(self, size=None):
+        self.size = HUD_TEXT_CACHE_SIZE if size is None else size
+        self.entries = OrderedDict()  # (font, text, color) -> Surface
+
+        # Statistik
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color):
+        """Gibt die gerenderte Surface für den Text zurück (aus dem Cache, falls vorhanden)"""
+        key = (font, text, color)
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, True, color)
+        self.entries[key] = surface
+        if len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+        return surface
+
+    def clear(self):
+        """Leert den Cache (Statistik bleibt erhalten)"""
+        self.entries.clear()
+
+    def stats(self):
+        """Gibt die Trefferstatistik des Caches zurück"""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
@@ -1,11 +1,18 @@
 import pygame as pg
-import random
 from settings import *
 from sprites.zombie import NormalZombie, FastZombie, StrongZombie
+from world.grid import REACHABLE
 
 
 class WaveManager:
-    """Verwaltet die Zombie-Wellen und deren Fortschritt"""
+    """Verwaltet die Zombie-Wellen und deren Fortschritt.
+
+    Eine neue Welle wird nicht auf einmal erzeugt, sondern in eine
+    Warteschlange gestellt. Pro Frame spawnen höchstens WAVE_SPAWNS_PER_FRAME
+    Zombies, und nur solange weniger als WAVE_MAX_ALIVE_ZOMBIES leben. Spawn-
+    Punkte sind freie, vom Spieler aus erreichbare Tiles knapp außerhalb des
+    sichtbaren Bereichs (bei einer Bildschirmkarte: am Kartenrand).
+    """
 
     def __init__(self, game):
         self.game = game
@@ -14,40 +21,120 @@ class WaveManager:
         self.wave_cooldown_timer = 0
         self.zombies_in_wave = 0
 
-        # Spawn-Positionen berechnen (Bildschirmränder)
-        self.spawn_positions = self.calculate_spawn_positions()
+        # Noch zu spawnende Zombie-Klassen der aktuellen Welle
+        self.spawn_queue = []
+
+        # Spawn-Tiles werden nach Änderungen an der Karte oder beim Verlassen des
+        # Kamera-Ausschnitts neu berechnet
+        self.spawn_tiles = []
+        self.spawn_tiles_version = None
+        self.spawn_area = None
+        self.reachable_mask = None
+        self.reachable_start = None
 
         # Erste Welle starten
         self.start_next_wave()
 
-    def calculate_spawn_positions(self):
-        """Berechnet mögliche Spawn-Positionen für Zombies am Bildschirmrand"""
-        positions = []
-
-        # Oberer Rand
-        for x in range(0, SCREEN_WIDTH, 50):
-            positions.append((x, -50))
-
-        # Unterer Rand
-        for x in range(0, SCREEN_WIDTH, 50):
-            positions.append((x, SCREEN_HEIGHT + 50))
-
-        # Linker Rand
-        for y in range(0, SCREEN_HEIGHT, 50):
-            positions.append((-50, y))
-
-        # Rechter Rand
-        for y in range(0, SCREEN_HEIGHT, 50):
-            positions.append((SCREEN_WIDTH + 50, y))
-
-        return positions
+    def calculate_spawn_tiles(self):
+        """Berechnet die Spawn-Tiles für den aktuellen Kamera-Ausschnitt.
+
+        Gespawnt wird in einem Ring knapp außerhalb des sichtbaren Bereichs, damit
+        Zombies nicht vor den Augen des Spielers erscheinen. Nur wenn die ganze
+        Karte auf einen Bildschirm passt, dient der Streifen am Kartenrand als Ring.
+        """
+        game_map = self.game.map
+        width, height = game_map.width, game_map.height
+
+        # Erreichbarkeit hängt nur von der Karte ab und wird pro Kartenversion berechnet
+        if self.spawn_tiles_version != game_map.version:
+            self.calculate_reachable()
+        mask, start = self.reachable_mask, self.reachable_start
+
+        self.spawn_area = self.current_spawn_area()
+        if self.spawn_area is None:
+            # Streifen an den Randwänden; nur dieser wird geprüft, nicht die ganze Karte
+            band = WAVE_SPAWN_EDGE_TILES
+            edge_columns = list(range(min(band + 1, width))) + list(range(max(width - 1 - band, band + 1), width))
+            ring = [(x, y) for y in range(height)
+                    for x in (range(width) if min(y, height - 1 - y) <= band else edge_columns)]
+        else:
+            # Ring um den Culling-Bereich, auf die Karte beschnitten
+            left, top, right, bottom = self.spawn_area
+            band = WAVE_SPAWN_RING_TILES
+            outer_left, outer_right = max(left - band, 0), min(right + band, width - 1)
+            side_columns = (list(range(outer_left, min(left, width)))
+                            + list(range(max(right + 1, 0), outer_right + 1)))
+            ring = [(x, y) for y in range(max(top - band, 0), min(bottom + band, height - 1) + 1)
+                    for x in (side_columns if top <= y <= bottom else range(outer_left, outer_right + 1))]
+        self.spawn_tiles = self.spawnable_tiles(mask, ring)
+
+        # Ring ganz in Wänden oder außerhalb der Karte: alle Tiles außerhalb des Bildschirms
+        if not self.spawn_tiles and self.spawn_area is not None:
+            view = self.game.camera.view
+            left, top = view.left // TILESIZE, view.top // TILESIZE
+            right, bottom = (view.right - 1) // TILESIZE, (view.bottom - 1) // TILESIZE
+            outside = ((x, y) for y in range(height) for x in range(width)
+                       if not (left <= x <= right and top <= y <= bottom))
+            self.spawn_tiles = self.spawnable_tiles(mask, outside)
+
+        # Sonst alle passenden erreichbaren Tiles, notfalls das Start-Tile
+        if not self.spawn_tiles:
+            every_tile = ((x, y) for y in range(height) for x in range(width))
+            self.spawn_tiles = self.spawnable_tiles(mask, every_tile) or [start]
+        return self.spawn_tiles
+
+    def calculate_reachable(self):
+        """Berechnet per Flood Fill vom Spieler aus, welche Tiles erreichbar sind"""
+        game_map = self.game.map
+        width, height, map_data = game_map.width, game_map.height, game_map.map_data
+        self.spawn_tiles_version = game_map.version
+
+        # Start beim Spieler, ersatzweise in der Kartenmitte (dort ist immer frei)
+        pos = self.game.player.pos
+        start = (int(pos.x // TILESIZE), int(pos.y // TILESIZE))
+        if not (0 <= start[0] < width and 0 <= start[1] < height) or map_data[start[1]][start[0]]:
+            start = (width // 2, height // 2)
+
+        # Erreichbare Tiles als Maske über den Tile-Puffer (Scanline-Flood-Fill)
+        self.reachable_mask = map_data.flood_fill(start)
+        self.reachable_start = start
+
+    def current_spawn_area(self):
+        """Culling-Bereich der Kamera in Tiles (links, oben, rechts, unten), None bei einer Bildschirmkarte"""
+        camera = self.game.camera
+        if camera.covers_map():
+            return None
+        rect = camera.cull_rect()
+        return (rect.left // TILESIZE, rect.top // TILESIZE,
+                (rect.right - 1) // TILESIZE, (rect.bottom - 1) // TILESIZE)
+
+    def spawnable_tiles(self, mask, tiles):
+        """Filtert erreichbare Tiles, auf denen auch der größte Zombie keine Wand berührt.
+
+        Sonst schiebt ihn die Wandkollision im ersten Frame aus der Karte.
+        """
+        width = self.game.map.width
+        size = max(ZOMBIE_NORMAL_SIZE, ZOMBIE_FAST_SIZE, ZOMBIE_STRONG_SIZE)
+        rect = pg.Rect(0, 0, size, size)
+        free = []
+        for x, y in tiles:
+            if mask[y * width + x] != REACHABLE:
+                continue
+            rect.center = (x * TILESIZE + TILESIZE // 2, y * TILESIZE + TILESIZE // 2)
+            if not self.game.wall_collider.collides(rect):
+                free.append((x, y))
+        return free
 
     def update(self):
-        """Aktualisiert den Status der aktuellen Welle"""
-        now = pg.time.get_ticks()
+        """Aktualisiert den Status der aktuellen Welle und spawnt Zombies aus der Warteschlange"""
+        now = self.game.clock.get_ticks()
+
+        # Zombies der Warteschlange im Rahmen des Budgets spawnen
+        if self.spawn_queue:
+            self.spawn_queued()
 
-        # Prüfen, ob alle Zombies in der aktuellen Welle besiegt wurden
-        if not self.wave_completed and len(self.game.zombies) == 0:
+        # Welle ist beendet, wenn alle Zombies gespawnt und besiegt wurden
+        if not self.wave_completed and not self.spawn_queue and len(self.game.zombies) == 0:
             self.wave_completed = True
             self.wave_cooldown_timer = now
 
@@ -63,14 +150,15 @@ class WaveManager:
         # Berechne Anzahl der Zombies für diese Welle
         self.zombies_in_wave = WAVE_BASE_ZOMBIES + (self.current_wave - 1) * WAVE_ZOMBIE_INCREMENT
 
-        # Spawne Zombies
+        # Zombies in die Warteschlange stellen, gespawnt wird in update()
         self.spawn_zombies()
 
-        # HUD-Nachricht für neue Welle
-        print(f"Wave {self.current_wave} started!")
+        # HUD-Nachricht für neue Welle (nicht in der Headless-Simulation)
+        if not self.game.headless:
+            print(f"Wave {self.current_wave} started!")
 
     def spawn_zombies(self):
-        """Spawnt Zombies für die aktuelle Welle"""
+        """Stellt die Zombies der aktuellen Welle in die Warteschlange"""
         # Bestimme Verteilung der Zombie-Typen basierend auf der aktuellen Welle
         normal_percentage = max(0.9 - (self.current_wave * 0.05), 0.4)  # Nimmt mit jeder Welle ab
         fast_percentage = min(0.1 + (self.current_wave * 0.03), 0.4)  # Steigt mit jeder Welle
@@ -81,20 +169,40 @@ class WaveManager:
         fast_count = int(self.zombies_in_wave * fast_percentage)
         strong_count = max(0, self.zombies_in_wave - normal_count - fast_count)  # Rest
 
-        # Zombies spawnen
-        for _ in range(normal_count):
-            self.spawn_random_zombie(NormalZombie)
-
-        for _ in range(fast_count):
-            self.spawn_random_zombie(FastZombie)
-
-        for _ in range(strong_count):
-            self.spawn_random_zombie(StrongZombie)
+        # Typen gemischt einreihen, damit nicht alle starken Zombies zuletzt kommen
+        queue = [NormalZombie] * normal_count + [FastZombie] * fast_count + [StrongZombie] * strong_count
+        self.game.rng.shuffle(queue)
+        self.spawn_queue.extend(queue)
+
+    def spawn_queued(self):
+        """Spawnt Zombies aus der Warteschlange bis zum Budget pro Frame und zur Obergrenze"""
+        budget = min(WAVE_SPAWNS_PER_FRAME, WAVE_MAX_ALIVE_ZOMBIES - len(self.game.zombies))
+        for _ in range(min(budget, len(self.spawn_queue))):
+            self.spawn_random_zombie(self.spawn_queue.pop())
+
+    def spawn_position(self):
+        """Wählt ein zufälliges Spawn-Tile mit Mindestabstand zum Spieler (Pixel-Mittelpunkt)"""
+        if (self.spawn_tiles_version != self.game.map.version
+                or self.spawn_area != self.current_spawn_area()):
+            self.calculate_spawn_tiles()
+
+        rng = self.game.rng
+        player = self.game.player.pos
+        for _ in range(8):
+            x, y = rng.choice(self.spawn_tiles)
+            pos = (x * TILESIZE + TILESIZE // 2, y * TILESIZE + TILESIZE // 2)
+            if player.distance_squared_to(pos) >= WAVE_SPAWN_MIN_DISTANCE ** 2:
+                break
+        # Nach mehreren zu nahen Versuchen wird der letzte genommen (z.B. sehr kleine Karte)
+        return pos
 
     def spawn_random_zombie(self, zombie_class):
-        """Spawnt einen Zombie an einer zufälligen Position am Rand"""
-        # Zufällige Position aus den vorberechneten Positionen wählen
-        pos = random.choice(self.spawn_positions)
+        """Spawnt einen Zombie an einem zufälligen Spawn-Tile"""
+        pos = self.spawn_position()
 
         # Zombie erstellen
-        zombie_class(self.game, pos[0], pos[1])
\ No newline at end of file
+        zombie = zombie_class(self.game, pos[0], pos[1])
+
+        # Im Batch-Modus übernimmt der Schwarm die Simulation
+        if self.game.zombie_swarm:
+            self.game.zombie_swarm.add(zombie)
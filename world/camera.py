@@ -0,0 +1,41 @@
+import pygame as pg
+from settings import *
+
+
+class Camera:
+    """Sichtbarer Ausschnitt der Karte, folgt dem Spieler.
+
+    Die Kamera bleibt innerhalb der Kartengrenzen; ist die Karte kleiner als
+    der Bildschirm, bleibt der Offset (0, 0). Der Offset ist ganzzahlig, damit
+    Hintergrund und Sprites pixelgenau zueinander liegen.
+    """
+
+    def __init__(self, game_map, margin=None):
+        self.map_width = game_map.pixel_width
+        self.map_height = game_map.pixel_height
+        self.view = pg.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)  # In Weltkoordinaten
+        self.margin = CAMERA_CULL_MARGIN if margin is None else margin
+
+    @property
+    def offset(self):
+        """Weltposition der linken oberen Bildschirmecke"""
+        return self.view.x, self.view.y
+
+    def update(self, target):
+        """Zentriert die Kamera auf das Ziel (Weltkoordinaten), begrenzt auf die Karte"""
+        x = int(round(target.x)) - SCREEN_WIDTH // 2
+        y = int(round(target.y)) - SCREEN_HEIGHT // 2
+        self.view.x = max(0, min(x, self.map_width - SCREEN_WIDTH))
+        self.view.y = max(0, min(y, self.map_height - SCREEN_HEIGHT))
+
+    def covers_map(self):
+        """True, wenn die ganze Karte auf den Bildschirm passt (kein Culling nötig)"""
+        return self.map_width <= SCREEN_WIDTH and self.map_height <= SCREEN_HEIGHT
+
+    def cull_rect(self):
+        """Sichtbarer Bereich plus Rand; nur Objekte darin werden gezeichnet und animiert"""
+        return self.view.inflate(2 * self.margin, 2 * self.margin)
+
+    def screen_to_world(self, pos):
+        """Rechnet eine Bildschirmposition (z.B. Maus) in Weltkoordinaten um"""
+        return pg.math.Vector2(pos[0] + self.view.x, pos[1] + self.view.y)
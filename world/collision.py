@@ -0,0 +1,89 @@
+import math
+import pygame as pg
+from settings import *
+
+
+class WallCollider:
+    """Kollisionsabfrage gegen Wände über das Tile-Gitter der Karte statt über alle Wand-Sprites"""
+
+    def __init__(self, game_map):
+        self.map = game_map
+        self.tile_size = game_map.tile_size
+
+    def tile_range(self, rect):
+        """Gibt die Tile-Bereiche (x und y) zurück, die das Rect überlappt"""
+        ts = self.tile_size
+        x0 = max(rect.left // ts, 0)
+        x1 = min((rect.right - 1) // ts, self.map.width - 1)
+        y0 = max(rect.top // ts, 0)
+        y1 = min((rect.bottom - 1) // ts, self.map.height - 1)
+        return range(x0, x1 + 1), range(y0, y1 + 1)
+
+    def colliding_walls(self, rect):
+        """Gibt die Rects aller Wand-Tiles zurück, die das Rect überlappt (zeilenweise sortiert)"""
+        map_data = self.map.map_data
+        ts = self.tile_size
+        cols, rows = self.tile_range(rect)
+        hits = []
+        for y in rows:
+            row = map_data[y]
+            for x in cols:
+                if row[x] == 1:
+                    hits.append(pg.Rect(x * ts, y * ts, ts, ts))
+        return hits
+
+    def line_of_sight(self, start, end, radius=0):
+        """Prüft, ob die Strecke zwischen zwei Pixel-Punkten keine Wand schneidet.
+
+        Mit radius > 0 werden zusätzlich zwei parallele Strahlen im Abstand
+        radius geprüft (z.B. für die Breite eines Projektils).
+        """
+        if radius:
+            dx, dy = end[0] - start[0], end[1] - start[1]
+            length = math.hypot(dx, dy)
+            if length:
+                nx, ny = -dy / length * radius, dx / length * radius
+                for side in (-1, 1):
+                    if not self.ray_clear((start[0] + side * nx, start[1] + side * ny),
+                                          (end[0] + side * nx, end[1] + side * ny)):
+                        return False
+        return self.ray_clear(start, end)
+
+    def ray_clear(self, start, end):
+        """Grid-Ray (DDA): geht von Tile zu Tile jeweils über die nächste Tile-Grenze und prüft jedes Tile"""
+        ts = self.tile_size
+        map_data = self.map.map_data
+        x, y = int(start[0] // ts), int(start[1] // ts)
+        end_x, end_y = int(end[0] // ts), int(end[1] // ts)
+        dx, dy = end[0] - start[0], end[1] - start[1]
+        step_x = 1 if dx > 0 else -1
+        step_y = 1 if dy > 0 else -1
+
+        # Strahlparameter (0 = Start, 1 = Ende) bis zur nächsten Grenze und pro Tile
+        inf = float('inf')
+        next_x = ((x + (step_x > 0)) * ts - start[0]) / dx if dx else inf
+        next_y = ((y + (step_y > 0)) * ts - start[1]) / dy if dy else inf
+        delta_x = ts / abs(dx) if dx else inf
+        delta_y = ts / abs(dy) if dy else inf
+
+        for _ in range(abs(end_x - x) + abs(end_y - y) + 1):
+            if not (0 <= x < self.map.width and 0 <= y < self.map.height) or map_data[y][x] == 1:
+                return False
+            if next_x < next_y:
+                next_x += delta_x
+                x += step_x
+            else:
+                next_y += delta_y
+                y += step_y
+        return True
+
+    def collides(self, rect):
+        """Prüft, ob das Rect irgendeine Wand berührt"""
+        map_data = self.map.map_data
+        cols, rows = self.tile_range(rect)
+        for y in rows:
+            row = map_data[y]
+            for x in cols:
+                if row[x] == 1:
+                    return True
+        return False
@@ -0,0 +1,137 @@
+import math
+from settings import *
+
+
+class CrowdSteering:
+    """Schwarmverhalten der Zombies (Boids): Abstand halten, mitlaufen, Wänden ausweichen.
+
+    Einmal pro Tick werden Position und Geschwindigkeit aller Zombies in ein
+    gleichmäßiges Nachbargitter mit der Zellgröße des Nachbarradius
+    eingetragen. Ein Zombie prüft dann nur die 3x3 Zellen um sich herum statt
+    alle anderen Zombies. Die Steuerkräfte verändern nur die Richtung der
+    gewünschten Geschwindigkeit; das Tempo (speed) des Zombies bleibt die
+    Obergrenze.
+    """
+
+    def __init__(self, game, radius=None):
+        self.game = game
+        self.radius = CROWD_NEIGHBOR_RADIUS if radius is None else radius
+        # (Zelle x, Zelle y) -> Liste von (Zombie, x, y, vx, vy, Radius)
+        self.cells = {}
+        # Zombie -> Einfügereihenfolge, trennt exakt übereinanderliegende Zombies deterministisch
+        self.orders = {}
+
+    def rebuild(self, zombies):
+        """Trägt alle Zombies mit ihrem Zustand vom Beginn des Ticks in das Gitter ein"""
+        cells = self.cells
+        cells.clear()
+        self.orders.clear()
+        size = self.radius
+        for order, zombie in enumerate(zombies):
+            self.orders[zombie] = order
+            pos, vel = zombie.pos, zombie.vel
+            entry = (zombie, pos.x, pos.y, vel.x, vel.y, zombie.rect.width / 2)
+            key = (int(pos.x // size), int(pos.y // size))
+            bucket = cells.get(key)
+            if bucket is None:
+                cells[key] = [entry]
+            else:
+                bucket.append(entry)
+
+    def steer(self, zombie, desired):
+        """Gibt die gewünschte Geschwindigkeit ergänzt um die Schwarmkräfte zurück"""
+        speed = zombie.speed
+        if not speed:
+            return desired
+        x, y = zombie.pos.x, zombie.pos.y
+        own_radius = zombie.rect.width / 2
+
+        # Gewünschte Richtung (Länge 1, oder 0 wenn der Zombie am Ziel steht)
+        force_x, force_y = desired.x / speed, desired.y / speed
+
+        # Separation und Alignment über die Nachbarzellen
+        sep_x = sep_y = 0.0
+        align_x = align_y = 0.0
+        neighbors = 0
+        radius = self.radius
+        cx, cy = int(x // radius), int(y // radius)
+        cells = self.cells
+        for ny in (cy - 1, cy, cy + 1):
+            for nx in (cx - 1, cx, cx + 1):
+                bucket = cells.get((nx, ny))
+                if not bucket:
+                    continue
+                for other, ox, oy, ovx, ovy, other_radius in bucket:
+                    if other is zombie:
+                        continue
+                    dx, dy = x - ox, y - oy
+                    dist_sq = dx * dx + dy * dy
+                    if dist_sq >= radius * radius:
+                        continue
+                    neighbors += 1
+                    align_x += ovx
+                    align_y += ovy
+
+                    # Abstoßung, solange sich die Körper (plus Abstand) überlappen
+                    spacing = own_radius + other_radius
+                    if dist_sq < spacing * spacing:
+                        dist = math.sqrt(dist_sq)
+                        if dist > 0:
+                            strength = 1 - dist / spacing
+                            sep_x += dx / dist * strength
+                            sep_y += dy / dist * strength
+                        else:
+                            # Genau übereinander (z.B. gleiches Spawn-Tile): nach Reihenfolge auseinander
+                            sep_x += 1 if self.orders.get(zombie, -1) < self.orders[other] else -1
+
+        force_x += sep_x * CROWD_SEPARATION_WEIGHT
+        force_y += sep_y * CROWD_SEPARATION_WEIGHT
+        if neighbors:
+            force_x += align_x / (neighbors * speed) * CROWD_ALIGNMENT_WEIGHT
+            force_y += align_y / (neighbors * speed) * CROWD_ALIGNMENT_WEIGHT
+
+        # Wandausweichen entlang der bisher resultierenden Richtung; der Anteil gegen
+        # die gewünschte Richtung entfällt, damit Durchgänge passierbar bleiben
+        wall_x, wall_y = self.wall_avoidance(x, y, force_x, force_y, own_radius)
+        dot = wall_x * desired.x + wall_y * desired.y
+        if dot < 0:
+            wall_x -= dot * desired.x / (speed * speed)
+            wall_y -= dot * desired.y / (speed * speed)
+        force_x += wall_x * CROWD_WALL_WEIGHT
+        force_y += wall_y * CROWD_WALL_WEIGHT
+
+        # Auf das Tempo des Zombies begrenzen
+        length = math.hypot(force_x, force_y)
+        if length > 1:
+            force_x /= length
+            force_y /= length
+        desired.update(force_x * speed, force_y * speed)
+        return desired
+
+    def wall_avoidance(self, x, y, dir_x, dir_y, own_radius):
+        """Abstoßung von der Wand, in die ein Tastpunkt vor dem Zombie in Laufrichtung fällt.
+
+        Der Tastpunkt liegt halbe Größe plus CROWD_WALL_DISTANCE voraus; die
+        Kraft zeigt vom nächsten Punkt des Wand-Tiles weg und wächst mit der Nähe.
+        """
+        length = math.hypot(dir_x, dir_y)
+        if length == 0:
+            return 0.0, 0.0
+        reach = own_radius + CROWD_WALL_DISTANCE
+        probe_x = x + dir_x / length * reach
+        probe_y = y + dir_y / length * reach
+
+        game_map = self.game.map
+        ts = TILESIZE
+        tx, ty = int(probe_x // ts), int(probe_y // ts)
+        if not (0 <= tx < game_map.width and 0 <= ty < game_map.height) or game_map.map_data[ty][tx] != 1:
+            return 0.0, 0.0
+
+        # Nächster Punkt des Wand-Tiles zum Zombie
+        dx = x - min(max(x, tx * ts), (tx + 1) * ts)
+        dy = y - min(max(y, ty * ts), (ty + 1) * ts)
+        dist = math.hypot(dx, dy)
+        if not 0 < dist < reach:
+            return 0.0, 0.0
+        strength = 1 - dist / reach
+        return dx / dist * strength, dy / dist * strength
@@ -0,0 +1,116 @@
+import pygame as pg
+import heapq
+from settings import *
+from world.pathfinding import NEIGHBORS
+
+
+class FlowField:
+    """Gemeinsames Richtungsfeld zum Spieler für die Navigation aller Zombies.
+
+    Ein einziger Dijkstra-Durchlauf vom Tile des Spielers liefert für jedes
+    erreichbare Tile das nächste Tile auf dem kürzesten Weg. Zombies steuern
+    auf dessen Mittelpunkt zu, damit sie nicht an Wandecken hängen bleiben.
+    Das Feld wird nur neu berechnet, wenn der Spieler das Tile wechselt oder
+    sich die Wände ändern. Es reicht höchstens max_distance Tiles weit, damit
+    die Kosten auch auf sehr großen Karten begrenzt bleiben; weiter entfernte
+    Zombies laufen direkt auf den Spieler zu.
+    """
+
+    def __init__(self, game, max_distance=None):
+        self.game = game
+        self.map = game.map
+        self.width = self.map.width
+        self.height = self.map.height
+        self.max_distance = FLOW_FIELD_MAX_DISTANCE if max_distance is None else max_distance
+
+        # Flache Arrays über alle Tiles (Index = y * width + x), werden wiederverwendet
+        self.distances = [float('inf')] * (self.width * self.height)
+        self.next_tiles = [None] * (self.width * self.height)
+        self.touched = []  # Indizes, die die letzte Berechnung gesetzt hat
+
+        # Zustand der letzten Berechnung
+        self.target_tile = None
+        self.map_version = None
+        self.version = 0  # Wird bei jeder Neuberechnung erhöht
+
+    def update(self):
+        """Berechnet das Feld neu, falls der Spieler das Tile gewechselt hat oder die Karte geändert wurde"""
+        pos = self.game.player.pos
+        tile = (int(pos.x // TILESIZE), int(pos.y // TILESIZE))
+        if tile != self.target_tile or self.map.version != self.map_version:
+            self.compute(tile)
+
+    def is_open(self, x, y):
+        """Prüft, ob ein Tile innerhalb der Karte liegt und keine Wand ist"""
+        return 0 <= x < self.width and 0 <= y < self.height and self.map.map_data[y][x] == 0
+
+    def compute(self, target):
+        """Dijkstra vom Ziel-Tile, begrenzt auf max_distance"""
+        self.target_tile = target
+        self.map_version = self.map.version
+        self.version += 1
+
+        # Nur die Einträge der letzten Berechnung zurücksetzen statt die Arrays neu anzulegen
+        width, height = self.width, self.height
+        distances, next_tiles = self.distances, self.next_tiles
+        inf = float('inf')
+        for index in self.touched:
+            distances[index] = inf
+            next_tiles[index] = None
+        touched = self.touched = []
+
+        tx, ty = target
+        if not self.is_open(tx, ty):
+            return
+
+        cells = self.map.map_data.cells
+        max_distance = self.max_distance
+        distances[ty * width + tx] = 0
+        touched.append(ty * width + tx)
+        open_set = [(0, tx, ty)]
+
+        while open_set:
+            dist, x, y = heapq.heappop(open_set)
+            if dist > distances[y * width + x]:
+                continue
+
+            for dx, dy, cost in NEIGHBORS:
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < width and 0 <= ny < height) or cells[ny * width + nx]:
+                    continue
+
+                # Diagonale Bewegung nicht über Wandecken
+                if dx != 0 and dy != 0:
+                    if cells[ny * width + x] or cells[y * width + nx]:
+                        continue
+
+                new_dist = dist + cost
+                if new_dist > max_distance:
+                    continue
+                index = ny * width + nx
+                if new_dist < distances[index]:
+                    if distances[index] == inf:
+                        touched.append(index)
+                    distances[index] = new_dist
+                    # Vom Nachbarn aus führt der Weg über das aktuelle Tile
+                    next_tiles[index] = (x, y)
+                    heapq.heappush(open_set, (new_dist, nx, ny))
+
+    def direction_at(self, pos):
+        """Gibt die normalisierte Laufrichtung für eine Pixel-Position zurück.
+
+        None außerhalb des Feldes, auf unerreichbaren Tiles und im Ziel-Tile.
+        """
+        x, y = int(pos[0] // TILESIZE), int(pos[1] // TILESIZE)
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        next_tile = self.next_tiles[y * self.width + x]
+        if next_tile is None:
+            return None
+
+        # Auf den Mittelpunkt des nächsten Tiles zusteuern
+        direction = pg.math.Vector2(next_tile[0] * TILESIZE + TILESIZE / 2 - pos[0],
+                                    next_tile[1] * TILESIZE + TILESIZE / 2 - pos[1])
+        if direction.length_squared() == 0:
+            return None
+        return direction.normalize()
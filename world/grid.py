@@ -0,0 +1,118 @@
+try:
+    import numpy as np
+except ImportError:  # numpy ist nur für die Batch-Systeme nötig
+    np = None
+
+# Werte in der Maske von TileGrid.flood_fill
+REACHABLE = 2
+
+# bytes.translate-Tabelle: erreichbar -> frei, Wand und unerreichbar frei -> Wand
+CLOSE_POCKETS = bytes([1, 1, 0]) + bytes(range(3, 256))
+
+
+class TileGrid:
+    """Kompaktes Tile-Gitter mit einem Byte pro Tile (0 = freier Raum, 1 = Wand).
+
+    Alle Tiles liegen zeilenweise in einem gemeinsamen bytearray (Index =
+    y * width + x). Karte, Kollision, Pathfinding und die NumPy-Systeme
+    arbeiten auf demselben Puffer, statt eigene Kopien zu halten. grid[y][x]
+    funktioniert wie bei einer Liste von Zeilen: die Zeilen sind memoryviews
+    auf den Puffer, Änderungen sind sofort überall sichtbar.
+    """
+
+    def __init__(self, width, height, data=None):
+        self.width = width
+        self.height = height
+        self.cells = bytearray(data) if data is not None else bytearray(width * height)
+        view = memoryview(self.cells)
+        self.rows = [view[y * width:(y + 1) * width] for y in range(height)]
+        self.array = None  # NumPy-Sicht auf den Puffer, wird bei Bedarf angelegt
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Erstellt ein Gitter aus einer Liste von Zeilen (z.B. [[0, 1, ...], ...])"""
+        rows = list(rows)
+        width = len(rows[0]) if rows else 0
+        return cls(width, len(rows), b''.join(bytes(row) for row in rows))
+
+    def __getitem__(self, y):
+        return self.rows[y]
+
+    def __len__(self):
+        return self.height
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __reduce__(self):
+        # memoryviews lassen sich nicht picklen, übertragen wird nur der Puffer (z.B. an Worker-Prozesse)
+        return TileGrid, (self.width, self.height, bytes(self.cells))
+
+    def copy(self):
+        """Unabhängige Kopie des Gitters"""
+        return TileGrid(self.width, self.height, self.cells)
+
+    def count(self, value=1):
+        """Anzahl der Tiles mit diesem Wert"""
+        return self.cells.count(value)
+
+    def as_array(self):
+        """NumPy-Sicht (height x width) auf den Puffer; Änderungen am Gitter sind sofort sichtbar"""
+        if self.array is None:
+            self.array = np.frombuffer(self.cells, dtype=np.uint8).reshape(self.height, self.width)
+        return self.array
+
+    def walls_at(self, cols, rows):
+        """Prüft für NumPy-Arrays von Tile-Koordinaten, ob dort eine Wand steht (außerhalb: keine Wand)"""
+        walls = self.as_array()
+        inside = (cols >= 0) & (cols < self.width) & (rows >= 0) & (rows < self.height)
+        result = np.zeros(cols.shape, dtype=bool)
+        result[inside] = walls[rows[inside], cols[inside]]
+        return result
+
+    def flood_fill(self, start):
+        """Markiert alle vom Start-Tile aus erreichbaren freien Tiles (4er-Nachbarschaft).
+
+        Gibt eine Kopie des Puffers zurück, in der erreichbare Tiles den Wert
+        REACHABLE haben. Als Scanline-Füllung sucht sie freie Abschnitte einer
+        Zeile mit bytearray.find und markiert sie per Slice; Python-Code läuft
+        nur einmal pro Abschnitt statt pro Tile.
+        """
+        width = self.width
+        mask = bytearray(self.cells)
+        x, y = start
+        if not (0 <= x < width and 0 <= y < self.height) or mask[y * width + x] != 0:
+            return mask
+
+        size = len(mask)
+        stack = [y * width + x]
+        while stack:
+            index = stack.pop()
+            if mask[index] != 0:
+                continue
+
+            # Freien Abschnitt der Zeile nach links und rechts bis zur nächsten Wand bzw. Markierung ausdehnen
+            row_start = index - index % width
+            row_end = row_start + width
+            left = max(mask.rfind(1, row_start, index), mask.rfind(REACHABLE, row_start, index), row_start - 1) + 1
+            right = min(end for end in (mask.find(1, index, row_end), mask.find(REACHABLE, index, row_end), row_end)
+                        if end >= 0)
+            mask[left:right] = bytes([REACHABLE]) * (right - left)
+
+            # In der Zeile darüber und darunter jeden freien Abschnitt einmal als Startpunkt merken
+            for offset in (-width, width):
+                pos, end = left + offset, right + offset
+                if pos < 0 or end > size:
+                    continue
+                while True:
+                    pos = mask.find(0, pos, end)
+                    if pos < 0:
+                        break
+                    stack.append(pos)
+                    pos = min(stop for stop in (mask.find(1, pos, end), mask.find(REACHABLE, pos, end), end)
+                              if stop >= 0)
+        return mask
+
+    def close_unreachable(self, start):
+        """Macht alle freien Tiles, die vom Start-Tile aus nicht erreichbar sind, zu Wänden"""
+        self.cells[:] = self.flood_fill(start).translate(CLOSE_POCKETS)
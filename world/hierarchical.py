@@ -0,0 +1,294 @@
+import heapq
+from settings import *
+
+
+class HierarchicalPathFinder:
+    """Hierarchisches Pathfinding (HPA*) auf Basis eines PathFinder.
+
+    Das Gitter wird in Cluster aufgeteilt. An den Grenzen zwischen
+    benachbarten Clustern liegen Eingänge (abstrakte Knoten), deren
+    Entfernungen innerhalb eines Clusters vorberechnet werden. Eine
+    Suche läuft dann über den abstrakten Graphen und setzt den Pfad aus
+    den gespeicherten Teilstücken zusammen. Ändert sich ein Tile, werden
+    nur der betroffene Cluster und seine direkten Nachbarn neu aufgebaut.
+    """
+
+    def __init__(self, pathfinder, cluster_size=None):
+        if cluster_size is None:
+            cluster_size = HPA_CLUSTER_SIZE
+        self.pathfinder = pathfinder
+        self.cluster_size = cluster_size
+        self.width = pathfinder.width
+        self.height = pathfinder.height
+        self.clusters_x = (self.width + cluster_size - 1) // cluster_size
+        self.clusters_y = (self.height + cluster_size - 1) // cluster_size
+
+        # (Cluster A, Cluster B) -> Liste von Übergängen (Tile in A, Tile in B)
+        self.borders = {}
+        # Tile -> Menge der Tiles im Nachbarcluster, die über einen Eingang verbunden sind
+        self.inter_edges = {}
+        # Cluster -> {Tile: {Tile: (Kosten, Pfad)}}
+        self.intra_edges = {}
+
+        self.build()
+
+    @property
+    def version(self):
+        """Wand-Version des zugrunde liegenden PathFinder"""
+        return self.pathfinder.version
+
+    @property
+    def cache_version(self):
+        """Version des zugrunde liegenden PathFinder, ändert sich nur beim kompletten Neuaufbau"""
+        return self.pathfinder.cache_version
+
+    def snapshot(self):
+        """Snapshot der Wandmatrix (für Worker der PathRequestQueue)"""
+        return self.pathfinder.snapshot()
+
+    def cluster_of(self, tile):
+        """Gibt den Cluster eines Tiles zurück"""
+        return tile[0] // self.cluster_size, tile[1] // self.cluster_size
+
+    def cluster_bounds(self, cluster):
+        """Gibt die Tile-Grenzen (x0, y0, x1, y1) eines Clusters zurück (x1/y1 exklusiv)"""
+        cs = self.cluster_size
+        x0, y0 = cluster[0] * cs, cluster[1] * cs
+        return x0, y0, min(x0 + cs, self.width), min(y0 + cs, self.height)
+
+    def adjacent_clusters(self, cluster):
+        """Gibt die (bis zu vier) orthogonal benachbarten Cluster zurück"""
+        cx, cy = cluster
+        return [(nx, ny) for nx, ny in ((cx + 1, cy), (cx - 1, cy), (cx, cy + 1), (cx, cy - 1))
+                if 0 <= nx < self.clusters_x and 0 <= ny < self.clusters_y]
+
+    def build(self):
+        """Baut den kompletten abstrakten Graphen auf"""
+        self.borders.clear()
+        self.inter_edges.clear()
+        self.intra_edges.clear()
+
+        for cy in range(self.clusters_y):
+            for cx in range(self.clusters_x):
+                if cx + 1 < self.clusters_x:
+                    self.build_border((cx, cy), (cx + 1, cy))
+                if cy + 1 < self.clusters_y:
+                    self.build_border((cx, cy), (cx, cy + 1))
+
+        for cy in range(self.clusters_y):
+            for cx in range(self.clusters_x):
+                self.build_cluster((cx, cy))
+
+    def update_tile(self, x, y):
+        """Baut nach einer Änderung an Tile (x, y) nur die betroffenen Cluster neu auf.
+
+        Die Wandmatrix des PathFinder muss bereits aktualisiert sein (PathFinder.set_tile).
+        """
+        cluster = self.cluster_of((x, y))
+        neighbors = self.adjacent_clusters(cluster)
+
+        # Eingänge an allen Grenzen des Clusters neu bestimmen
+        for other in neighbors:
+            self.build_border(min(cluster, other), max(cluster, other))
+
+        # Distanzen im Cluster selbst und in den Nachbarn (deren Eingänge sich geändert haben können)
+        for affected in [cluster] + neighbors:
+            self.build_cluster(affected)
+
+    def on_tile_changed(self, x, y, value):
+        """Listener von Map.set_tile (nach dem PathFinder registriert)"""
+        self.update_tile(x, y)
+
+    def build_border(self, cluster_a, cluster_b):
+        """Bestimmt die Eingänge an der Grenze zwischen zwei benachbarten Clustern"""
+        walls = self.pathfinder.walls
+
+        # Alte Übergänge entfernen
+        for tile_a, tile_b in self.borders.pop((cluster_a, cluster_b), []):
+            self.inter_edges.get(tile_a, set()).discard(tile_b)
+            self.inter_edges.get(tile_b, set()).discard(tile_a)
+
+        # Tile-Paare entlang der Grenze (A links/oben, B rechts/unten)
+        ax0, ay0, ax1, ay1 = self.cluster_bounds(cluster_a)
+        if cluster_b[0] != cluster_a[0]:
+            pairs = [((ax1 - 1, y), (ax1, y)) for y in range(ay0, ay1)]
+        else:
+            pairs = [((x, ay1 - 1), (x, ay1)) for x in range(ax0, ax1)]
+
+        # Zusammenhängende freie Abschnitte zu Eingängen zusammenfassen
+        transitions = []
+        segment = []
+        for pair in pairs + [None]:
+            if pair is not None and not walls[pair[0][1]][pair[0][0]] and not walls[pair[1][1]][pair[1][0]]:
+                segment.append(pair)
+                continue
+            if segment:
+                if len(segment) < HPA_WIDE_ENTRANCE:
+                    transitions.append(segment[len(segment) // 2])
+                else:
+                    # Breite Eingänge bekommen an beiden Enden einen Übergang
+                    transitions.append(segment[0])
+                    transitions.append(segment[-1])
+                segment = []
+
+        self.borders[(cluster_a, cluster_b)] = transitions
+        for tile_a, tile_b in transitions:
+            self.inter_edges.setdefault(tile_a, set()).add(tile_b)
+            self.inter_edges.setdefault(tile_b, set()).add(tile_a)
+
+    def cluster_nodes(self, cluster):
+        """Alle abstrakten Knoten (Eingangs-Tiles) eines Clusters"""
+        nodes = set()
+        for other in self.adjacent_clusters(cluster):
+            key = (min(cluster, other), max(cluster, other))
+            for tile_a, tile_b in self.borders.get(key, []):
+                nodes.add(tile_a if self.cluster_of(tile_a) == cluster else tile_b)
+        return nodes
+
+    def build_cluster(self, cluster):
+        """Berechnet die Distanzen zwischen allen Eingängen innerhalb eines Clusters"""
+        nodes = self.cluster_nodes(cluster)
+        edges = {}
+        for node in nodes:
+            costs, came_from = self.search_cluster(node, cluster)
+            edges[node] = {}
+            for other in nodes:
+                if other != node and other in costs:
+                    edges[node][other] = (costs[other], self.trace(came_from, other))
+        self.intra_edges[cluster] = edges
+
+    def search_cluster(self, start, cluster):
+        """Dijkstra von einem Tile aus, beschränkt auf einen Cluster"""
+        width = self.width
+        neighbors_of = self.pathfinder.neighbors_of
+        x0, y0, x1, y1 = self.cluster_bounds(cluster)
+
+        start_index = start[1] * width + start[0]
+        costs = {start_index: 0}
+        came_from = {start_index: None}
+        open_set = [(0, start_index)]
+        while open_set:
+            cost, current = heapq.heappop(open_set)
+            if cost > costs[current]:
+                continue
+            for neighbor, move_cost in neighbors_of(current):
+                nx, ny = neighbor % width, neighbor // width
+                if not (x0 <= nx < x1 and y0 <= ny < y1):
+                    continue
+                new_cost = cost + move_cost
+                if new_cost < costs.get(neighbor, float('inf')):
+                    costs[neighbor] = new_cost
+                    came_from[neighbor] = current
+                    heapq.heappush(open_set, (new_cost, neighbor))
+
+        tile_costs = {(i % width, i // width): c for i, c in costs.items()}
+        return tile_costs, came_from
+
+    def trace(self, came_from, tile):
+        """Rekonstruiert den Tile-Pfad aus einer Cluster-Suche (Start bis tile)"""
+        width = self.width
+        current = tile[1] * width + tile[0]
+        path = []
+        while current is not None:
+            path.append((current % width, current // width))
+            current = came_from[current]
+        return path[::-1]
+
+    def find_path(self, start, end):
+        """Findet einen Pfad von Start- zu Zielpunkt (Pixel) über den abstrakten Graphen"""
+        start_tile = (int(start[0] // TILESIZE), int(start[1] // TILESIZE))
+        end_tile = (int(end[0] // TILESIZE), int(end[1] // TILESIZE))
+        walls = self.pathfinder.walls
+
+        if not (0 <= start_tile[0] < self.width and 0 <= start_tile[1] < self.height and
+                0 <= end_tile[0] < self.width and 0 <= end_tile[1] < self.height):
+            return []
+        if walls[start_tile[1]][start_tile[0]] or walls[end_tile[1]][end_tile[0]]:
+            return []
+
+        start_cluster = self.cluster_of(start_tile)
+        end_cluster = self.cluster_of(end_tile)
+
+        # Kurze Anfragen (gleicher oder benachbarter Cluster) direkt mit A* lösen,
+        # dort wären die Umwege über die Eingänge am größten
+        if abs(start_cluster[0] - end_cluster[0]) <= 1 and abs(start_cluster[1] - end_cluster[1]) <= 1:
+            return self.pathfinder.find_path(start, end)
+
+        # Start und Ziel temporär mit den Eingängen ihres Clusters verbinden
+        start_costs, start_came_from = self.search_cluster(start_tile, start_cluster)
+        end_costs, end_came_from = self.search_cluster(end_tile, end_cluster)
+
+        abstract = self.search_abstract(start_tile, end_tile, start_costs, end_costs,
+                                        start_cluster, end_cluster)
+        if abstract is None:
+            return []
+
+        tiles = self.refine(abstract[1], start_came_from, end_came_from)
+        return [(x * TILESIZE + TILESIZE // 2, y * TILESIZE + TILESIZE // 2) for x, y in tiles]
+
+    def search_abstract(self, start_tile, end_tile, start_costs, end_costs, start_cluster, end_cluster):
+        """A* über die Eingänge; gibt (Kosten, Kantenfolge) oder None zurück"""
+        octile = self.pathfinder.octile
+        start_links = {node: start_costs[node] for node in self.cluster_nodes(start_cluster)
+                       if node in start_costs}
+        end_links = {node: end_costs[node] for node in self.cluster_nodes(end_cluster)
+                     if node in end_costs}
+        if not end_links and end_tile not in self.inter_edges:
+            return None
+
+        g_score = {start_tile: 0}
+        came_from = {}  # Knoten -> (Vorgänger, Kantentyp)
+        open_set = [(octile(*start_tile, *end_tile), start_tile)]
+        closed = set()
+
+        while open_set:
+            _, current = heapq.heappop(open_set)
+            if current in closed:
+                continue
+            if current == end_tile:
+                steps = []
+                while current in came_from:
+                    previous, kind = came_from[current]
+                    steps.append((previous, current, kind))
+                    current = previous
+                return g_score[end_tile], steps[::-1]
+            closed.add(current)
+
+            for neighbor, cost, kind in self.abstract_neighbors(current, start_tile, start_links, end_tile, end_links):
+                tentative = g_score[current] + cost
+                if tentative < g_score.get(neighbor, float('inf')):
+                    g_score[neighbor] = tentative
+                    came_from[neighbor] = (current, kind)
+                    heapq.heappush(open_set, (tentative + octile(*neighbor, *end_tile), neighbor))
+
+        return None
+
+    def abstract_neighbors(self, node, start_tile, start_links, end_tile, end_links):
+        """Nachbarn eines Knotens im abstrakten Graphen als (Knoten, Kosten, Kantentyp).
+
+        Zusätzlich zu den Eingängen gibt es temporäre Kanten vom Start und zum Ziel.
+        """
+        result = [(other, 1, 'inter') for other in self.inter_edges.get(node, ())]
+        result.extend((other, cost, 'intra') for other, (cost, _) in
+                      self.intra_edges.get(self.cluster_of(node), {}).get(node, {}).items())
+        if node == start_tile:
+            result.extend((other, cost, 'start') for other, cost in start_links.items())
+        if node in end_links:
+            result.append((end_tile, end_links[node], 'end'))
+        return result
+
+    def refine(self, steps, start_came_from, end_came_from):
+        """Setzt den Tile-Pfad aus den Teilstücken zwischen den abstrakten Knoten zusammen"""
+        tiles = [steps[0][0]]
+        for a, b, kind in steps:
+            if kind == 'inter':
+                segment = [a, b]
+            elif kind == 'intra':
+                segment = self.intra_edges[self.cluster_of(a)][a][b][1]
+            elif kind == 'start':
+                segment = self.trace(start_came_from, b)
+            else:
+                # Die Cluster-Suche des Ziels lief vom Ziel aus, daher umkehren
+                segment = self.trace(end_came_from, a)[::-1]
+            tiles.extend(segment[1:])
+        return tiles
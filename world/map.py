@@ -1,6 +1,7 @@
 import pygame as pg
-import random
+from collections import OrderedDict
 from settings import *
+from world.grid import TileGrid
 
 
 class Map:
@@ -9,99 +10,170 @@ class Map:
     def __init__(self, game):
         self.game = game
         self.tile_size = TILESIZE
-        self.width = GRIDWIDTH
-        self.height = GRIDHEIGHT
+        self.width = MAP_WIDTH
+        self.height = MAP_HEIGHT
+        self.pixel_width = self.width * TILESIZE
+        self.pixel_height = self.height * TILESIZE
         self.map_data = self.generate_map()
 
-        # Erzeuge Wände basierend auf der Map
-        self.create_walls()
+        # Versionszähler für map_data, wird bei jeder Änderung erhöht
+        self.version = 0
+
+        # Objekte mit on_tile_changed(x, y, value), die bei set_tile benachrichtigt werden
+        self.listeners = []
+
+        # Vorgerenderte Abschnitte der Karte (Boden, Gitter und Wände), werden bei Bedarf erzeugt.
+        # Bei großen Karten bleiben nur die zuletzt benutzten im Speicher (LRU)
+        self.chunk_pixels = MAP_CHUNK_SIZE * TILESIZE
+        self.chunks = OrderedDict()  # (Abschnitt x, Abschnitt y) -> Surface
+
+        # Hintergrund für den sichtbaren Bereich, deckt den ganzen Bildschirm ab.
+        # background_version ist (Karten-Version, Kamera-Offset) der letzten Zusammensetzung
+        self.background = pg.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.background_version = None
+        self.render_background()
 
     def generate_map(self):
-        """Erstellt eine zufällige Karte mit Wänden und offenem Raum"""
-        # Initialisiere leere Karte (0 = leerer Raum, 1 = Wand)
-        map_data = [[0 for _ in range(self.width)] for _ in range(self.height)]
+        """Erstellt eine zufällige Karte mit Wänden und offenem Raum.
+
+        Die Karte ist ein TileGrid (ein Byte pro Tile, 0 = leerer Raum, 1 = Wand).
+        Ränder und Hindernisse werden per Slice in den Puffer geschrieben; zum
+        Schluss werden alle vom Spielerstart aus unerreichbaren Taschen per
+        Flood Fill geschlossen, damit die Spielfläche zusammenhängt.
+        """
+        rng = self.game.rng
+        width, height = self.width, self.height
+        grid = TileGrid(width, height)
+        cells = grid.cells
 
         # Rand der Karte mit Wänden füllen
-        for x in range(self.width):
-            map_data[0][x] = 1
-            map_data[self.height - 1][x] = 1
-        for y in range(self.height):
-            map_data[y][0] = 1
-            map_data[y][self.width - 1] = 1
-
-        # Einige zufällige Hindernisse hinzufügen
-        for _ in range(20):  # Anzahl der Hindernisse
+        cells[0:width] = b'\x01' * width
+        cells[(height - 1) * width:] = b'\x01' * width
+        cells[0::width] = b'\x01' * height
+        cells[width - 1::width] = b'\x01' * height
+
+        # Einige zufällige Hindernisse hinzufügen, Anzahl wächst mit der Kartenfläche
+        obstacles = MAP_OBSTACLES * (width * height) // (GRIDWIDTH * GRIDHEIGHT)
+        for _ in range(obstacles):
             # Position festlegen
-            x = random.randint(2, self.width - 3)
-            y = random.randint(2, self.height - 3)
+            x = rng.randint(2, width - 3)
+            y = rng.randint(2, height - 3)
+            index = y * width + x
 
             # Unterschiedliche Hindernisformen
-            shape = random.choice(['block', 'horizontal', 'vertical'])
+            shape = rng.choice(['block', 'horizontal', 'vertical'])
 
             if shape == 'block':
                 # 2x2 Block
-                for dy in range(2):
-                    for dx in range(2):
-                        map_data[y + dy][x + dx] = 1
+                cells[index:index + 2] = b'\x01\x01'
+                cells[index + width:index + width + 2] = b'\x01\x01'
             elif shape == 'horizontal':
-                # Horizontale Linie
-                length = random.randint(3, 5)
-                for dx in range(length):
-                    if x + dx < self.width - 1:
-                        map_data[y][x + dx] = 1
+                # Horizontale Linie, endet vor dem rechten Rand
+                length = min(rng.randint(3, 5), width - 1 - x)
+                cells[index:index + length] = b'\x01' * length
             elif shape == 'vertical':
-                # Vertikale Linie
-                length = random.randint(3, 5)
-                for dy in range(length):
-                    if y + dy < self.height - 1:
-                        map_data[y + dy][x] = 1
+                # Vertikale Linie, endet vor dem unteren Rand
+                length = min(rng.randint(3, 5), height - 1 - y)
+                cells[index:index + length * width:width] = b'\x01' * length
 
         # Stelle sicher, dass der Spieler-Startpunkt frei ist
-        center_x = self.width // 2
-        center_y = self.height // 2
+        center_x = width // 2
+        center_y = height // 2
         for y in range(center_y - 2, center_y + 3):
-            for x in range(center_x - 2, center_x + 3):
-                map_data[y][x] = 0
-
-        return map_data
-
-    def create_walls(self):
-        """Erstellt Wand-Sprites basierend auf der Karte"""
-        for row, tiles in enumerate(self.map_data):
-            for col, tile in enumerate(tiles):
-                if tile == 1:  # Wand
-                    Wall(self.game, col, row)
-
-    def draw(self, screen):
-        """Zeichnet die Karte auf den Bildschirm"""
-        # Hintergrund zeichnen
-        for y in range(self.height):
-            for x in range(self.width):
-                rect = pg.Rect(x * self.tile_size, y * self.tile_size,
-                               self.tile_size, self.tile_size)
+            cells[y * width + center_x - 2:y * width + center_x + 3] = bytes(5)
+
+        # Vom Start aus unerreichbare Bereiche schließen
+        grid.close_unreachable((center_x, center_y))
+        return grid
+
+    def add_listener(self, listener):
+        """Registriert ein Objekt, dessen on_tile_changed(x, y, value) bei jeder Tile-Änderung aufgerufen wird"""
+        self.listeners.append(listener)
+
+    def is_border(self, x, y):
+        """Prüft, ob ein Tile zum Kartenrand gehört"""
+        return x <= 0 or y <= 0 or x >= self.width - 1 or y >= self.height - 1
+
+    def set_tile(self, x, y, value):
+        """Ändert ein Tile zur Laufzeit (0 = freier Raum, 1 = Wand).
+
+        Aktualisiert map_data (den gemeinsamen Puffer) und nur den betroffenen
+        Teil des Hintergrunds und benachrichtigt danach alle Listener (Pathfinding,
+        Renderer, ...), damit diese ebenfalls nur die betroffene Region neu
+        berechnen. Gibt False zurück, wenn das Tile den Wert schon hat.
+        """
+        if self.map_data[y][x] == value:
+            return False
+        self.map_data[y][x] = value
+        self.version += 1
+
+        # Nur den Abschnitt des Tiles verwerfen und das Tile im zusammengesetzten Hintergrund ersetzen
+        self.chunks.pop((x // MAP_CHUNK_SIZE, y // MAP_CHUNK_SIZE), None)
+        if self.background_version is not None and self.background_version[0] == self.version - 1:
+            self.patch_background(x, y, self.background_version[1])
+
+        for listener in self.listeners:
+            listener.on_tile_changed(x, y, value)
+        return True
+
+    def patch_background(self, x, y, offset):
+        """Übernimmt ein einzelnes Tile aus seinem neu gerenderten Abschnitt in den Hintergrund"""
+        ts = self.tile_size
+        cx, cy = x // MAP_CHUNK_SIZE, y // MAP_CHUNK_SIZE
+        area = pg.Rect((x - cx * MAP_CHUNK_SIZE) * ts, (y - cy * MAP_CHUNK_SIZE) * ts, ts, ts)
+        self.background.blit(self.get_chunk(cx, cy), (x * ts - offset[0], y * ts - offset[1]), area)
+        self.background_version = (self.version, offset)
+
+    def render_chunk(self, cx, cy):
+        """Rendert Boden, Gitterlinien und Wände eines Kartenabschnitts"""
+        ts = self.tile_size
+        chunk = pg.Surface((self.chunk_pixels, self.chunk_pixels))
+        chunk.fill(DARKGREY)
+        x0, y0 = cx * MAP_CHUNK_SIZE, cy * MAP_CHUNK_SIZE
+        for y in range(y0, min(y0 + MAP_CHUNK_SIZE, self.height)):
+            for x in range(x0, min(x0 + MAP_CHUNK_SIZE, self.width)):
+                rect = pg.Rect((x - x0) * ts, (y - y0) * ts, ts, ts)
 
                 # Unterschiedliche Farben für verschiedene Tile-Typen
                 if self.map_data[y][x] == 0:  # Freier Raum
-                    pg.draw.rect(screen, DARKGREY, rect)
                     # Gittermuster für bessere Visualisierung
-                    pg.draw.rect(screen, BLACK, rect, 1)
-
-
-class Wall(pg.sprite.Sprite):
-    """Hindernisse, die den Spieler und Zombies blockieren"""
-
-    def __init__(self, game, x, y):
-        self.groups = game.all_sprites, game.walls
-        pg.sprite.Sprite.__init__(self, self.groups)
-        self.game = game
-
-        # Bild und Rect
-        self.image = pg.Surface((TILESIZE, TILESIZE))
-        self.image.fill(LIGHTGREY)
-        self.rect = self.image.get_rect()
-        self.rect.x = x * TILESIZE
-        self.rect.y = y * TILESIZE
-
-        # Position in Tile-Koordinaten speichern
-        self.x = x
-        self.y = y
\ No newline at end of file
+                    pg.draw.rect(chunk, BLACK, rect, 1)
+                else:  # Wand
+                    pg.draw.rect(chunk, LIGHTGREY, rect)
+        return chunk
+
+    def get_chunk(self, cx, cy):
+        """Gibt einen Kartenabschnitt zurück und rendert ihn nur nach Änderungen an map_data neu"""
+        chunk = self.chunks.get((cx, cy))
+        if chunk is None:
+            chunk = self.chunks[(cx, cy)] = self.render_chunk(cx, cy)
+            if len(self.chunks) > MAP_CHUNK_CACHE_SIZE:
+                self.chunks.popitem(last=False)
+        else:
+            self.chunks.move_to_end((cx, cy))
+        return chunk
+
+    def render_background(self, offset=(0, 0)):
+        """Setzt den Hintergrund des sichtbaren Bereichs aus den Kartenabschnitten zusammen"""
+        ox, oy = offset
+        size = self.chunk_pixels
+        self.background.fill(DARKGREY)
+
+        # Nur Abschnitte, die den Bildschirm überlappen
+        cx0, cy0 = max(ox // size, 0), max(oy // size, 0)
+        cx1 = min((ox + SCREEN_WIDTH - 1) // size, (self.pixel_width - 1) // size)
+        cy1 = min((oy + SCREEN_HEIGHT - 1) // size, (self.pixel_height - 1) // size)
+        self.background.blits([(self.get_chunk(cx, cy), (cx * size - ox, cy * size - oy))
+                               for cy in range(cy0, cy1 + 1) for cx in range(cx0, cx1 + 1)], False)
+
+        self.background_version = (self.version, (ox, oy))
+
+    def get_background(self, offset=(0, 0)):
+        """Gibt den Hintergrund zurück; neu zusammengesetzt nur nach Kartenänderung oder Kamerabewegung"""
+        if self.background_version != (self.version, tuple(offset)):
+            self.render_background(offset)
+        return self.background
+
+    def draw(self, screen, offset=(0, 0)):
+        """Zeichnet den sichtbaren Teil der Karte auf den Bildschirm"""
+        screen.blit(self.get_background(offset), (0, 0))
@@ -0,0 +1,178 @@
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from settings import *
+from world.pathfinding import PathFinder
+from world.hierarchical import HierarchicalPathFinder
+
+
+# Pathfinder des Worker-Prozesses, wird vom Initializer aus einem Snapshot erstellt
+worker_pathfinder = None
+
+
+def init_worker(walls, hierarchical):
+    """Initialisiert den Pathfinder eines Workers mit einem Snapshot der Wandmatrix"""
+    global worker_pathfinder
+    worker_pathfinder = PathFinder(None, walls=walls)
+    if hierarchical:
+        worker_pathfinder = HierarchicalPathFinder(worker_pathfinder)
+
+
+def worker_find_path(start, end):
+    """Führt eine Suche im Worker aus"""
+    return worker_pathfinder.find_path(start, end)
+
+
+def worker_set_tiles(changes):
+    """Übernimmt Tile-Änderungen (x, y, Wert) in den Snapshot des Workers"""
+    hierarchical = isinstance(worker_pathfinder, HierarchicalPathFinder)
+    pathfinder = worker_pathfinder.pathfinder if hierarchical else worker_pathfinder
+    for x, y, value in changes:
+        pathfinder.set_tile(x, y, value)
+        if hierarchical:
+            worker_pathfinder.on_tile_changed(x, y, value)
+
+
+class PathRequestQueue:
+    """Warteschlange für Pfadanfragen mit Zeit- oder Anfragebudget pro Frame.
+
+    Zombies stellen Anfragen über request() und steuern direkt auf den Spieler
+    zu, bis ihr Pfad über on_path_found() eintrifft. Die Suchen laufen entweder
+    im Spiel-Thread (begrenzt durch budget_ms pro Frame) oder in einem Worker-
+    Thread/-Prozess auf einem Snapshot der Wandmatrix. Einzelne Tile-
+    Änderungen (on_tile_changed) werden dem Worker nachgereicht; neu
+    gestartet wird er nur, wenn die Wandmatrix komplett ersetzt wurde.
+
+    Mit request_budget werden stattdessen höchstens so viele Suchen pro Frame
+    im Spiel-Thread ausgeführt. Das Ergebnis hängt dann nicht von der
+    Rechenzeit ab, wie es Aufzeichnungen und Replays brauchen.
+    """
+
+    def __init__(self, pathfinder, budget_ms=None, worker=None, request_budget=None):
+        self.pathfinder = pathfinder
+        self.budget = (PATHFINDING_BUDGET_MS if budget_ms is None else budget_ms) / 1000.0
+        self.request_budget = request_budget  # None: Zeitbudget, sonst Anzahl Suchen pro Frame
+        self.worker = PATHFINDING_WORKER if worker is None else worker  # None, 'thread' oder 'process'
+        if request_budget is not None:
+            self.worker = None  # Worker liefern Ergebnisse je nach Rechenzeit in unterschiedlichen Frames
+
+        self.queue = deque()
+        self.pending = {}  # Anfragender -> (Start, Ziel)
+
+        # Worker-Zustand
+        self.executor = None
+        self.executor_version = None
+        self.in_flight = []  # (Anfragender, Anfrage, Future)
+        self.tile_changes = []  # Noch nicht an den Worker übergebene Änderungen (x, y, Wert)
+
+        # Statistik
+        self.completed = 0
+
+    def request(self, requester, start, end):
+        """Stellt eine Pfadanfrage; eine offene Anfrage desselben Zombies wird ersetzt"""
+        if requester not in self.pending:
+            self.queue.append(requester)
+        self.pending[requester] = (start, end)
+
+    def cancel(self, requester):
+        """Verwirft offene und laufende Anfragen (z.B. wenn der Zombie stirbt)"""
+        self.pending.pop(requester, None)
+        if self.in_flight:
+            self.in_flight = [entry for entry in self.in_flight if entry[0] is not requester]
+
+    def on_tile_changed(self, x, y, value):
+        """Listener von Map.set_tile: merkt die Änderung für den laufenden Worker vor"""
+        if self.executor is None:
+            return
+        self.tile_changes.append((x, y, value))
+
+        # Laufende Suchen kennen eine neue Wand noch nicht: neu einreihen, ihr Ergebnis wird verworfen
+        if value:
+            for requester, request, future in self.in_flight:
+                future.cancel()
+                if requester not in self.pending:
+                    self.request(requester, *request)
+            self.in_flight = []
+
+    def is_pending(self, requester):
+        """Prüft, ob für den Anfragenden noch ein Pfad aussteht"""
+        return requester in self.pending
+
+    def update(self):
+        """Bearbeitet Anfragen im Rahmen des Budgets, wird einmal pro Frame aufgerufen"""
+        if self.worker:
+            self.update_worker()
+            return
+        if self.request_budget is not None:
+            self.update_counted()
+            return
+
+        deadline = time.perf_counter() + self.budget
+        while self.queue and time.perf_counter() < deadline:
+            requester = self.queue.popleft()
+            request = self.pending.pop(requester, None)
+            if request is None or not requester.alive():
+                continue
+            self.deliver(requester, self.pathfinder.find_path(*request))
+
+    def update_counted(self):
+        """Bearbeitet höchstens request_budget Anfragen (deterministisch, unabhängig von der Rechenzeit)"""
+        searches = 0
+        while self.queue and searches < self.request_budget:
+            requester = self.queue.popleft()
+            request = self.pending.pop(requester, None)
+            if request is None or not requester.alive():
+                continue
+            self.deliver(requester, self.pathfinder.find_path(*request))
+            searches += 1
+
+    def update_worker(self):
+        """Verteilt Anfragen an den Worker und liefert fertige Ergebnisse aus"""
+        # Bei komplett ersetzter Wandmatrix einen neuen Worker mit frischem Snapshot starten
+        if self.executor_version != self.pathfinder.cache_version:
+            self.shutdown()
+            executor_class = ProcessPoolExecutor if self.worker == 'process' else ThreadPoolExecutor
+            self.executor = executor_class(max_workers=1, initializer=init_worker,
+                                           initargs=(self.pathfinder.snapshot(),
+                                                     isinstance(self.pathfinder, HierarchicalPathFinder)))
+            self.executor_version = self.pathfinder.cache_version
+
+        # Einzelne Tile-Änderungen nachreichen; der Worker bearbeitet Aufträge in Reihenfolge,
+        # später abgegebene Suchen sehen die Änderungen also schon
+        if self.tile_changes:
+            self.executor.submit(worker_set_tiles, self.tile_changes)
+            self.tile_changes = []
+
+        # Fertige Ergebnisse ausliefern (Anfragen, die inzwischen ersetzt wurden, verwerfen)
+        still_running = []
+        for requester, request, future in self.in_flight:
+            if not future.done():
+                still_running.append((requester, request, future))
+            elif requester.alive() and requester not in self.pending:
+                self.deliver(requester, future.result())
+        self.in_flight = still_running
+
+        # Neue Anfragen abgeben
+        while self.queue:
+            requester = self.queue.popleft()
+            request = self.pending.pop(requester, None)
+            if request is None or not requester.alive():
+                continue
+            self.in_flight.append((requester, request, self.executor.submit(worker_find_path, *request)))
+
+    def deliver(self, requester, path):
+        """Übergibt einen gefundenen Pfad an den Anfragenden"""
+        self.completed += 1
+        requester.on_path_found(path)
+
+    def shutdown(self):
+        """Beendet den Worker; laufende Anfragen werden neu eingereiht"""
+        if self.executor is None:
+            return
+        for requester, request, future in self.in_flight:
+            future.cancel()
+            if requester not in self.pending:
+                self.request(requester, *request)
+        self.in_flight = []
+        self.executor.shutdown(wait=False)
+        self.executor = None
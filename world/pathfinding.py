@@ -1,111 +1,319 @@
 import pygame as pg
 import heapq
+from array import array
+from collections import OrderedDict
 from settings import *
+from world.grid import TileGrid
+
+
+# Nachbarn (dx, dy, Kosten); diagonale Bewegung kostet √2 ≈ 1.414
+NEIGHBORS = [(0, 1, 1), (1, 0, 1), (0, -1, 1), (-1, 0, 1),
+             (1, 1, 1.414), (-1, 1, 1.414), (1, -1, 1.414), (-1, -1, 1.414)]
+
+
+class PathCache:
+    """LRU-Cache für gefundene Pfade, Schlüssel (Start-Tile, Ziel-Tile, Wand-Version).
+
+    Liegt das Start-Tile einer Anfrage auf einem bereits gespeicherten Pfad zum
+    selben Ziel, wird das restliche Teilstück dieses Pfades wiederverwendet
+    (Teilpfade kürzester Pfade sind selbst kürzeste Pfade).
+    """
+
+    def __init__(self, size=None):
+        self.size = PATH_CACHE_SIZE if size is None else size
+        self.entries = OrderedDict()  # (start, goal, version) -> Pfad
+        # (goal, version) -> {Tile: (Schlüssel, Position im Pfad)} für Teilpfade
+        self.by_goal = {}
+
+        # Statistik
+        self.hits = 0
+        self.suffix_hits = 0
+        self.misses = 0
+
+    def get(self, start_tile, goal_tile, version):
+        """Sucht einen Pfad im Cache, gibt None zurück, falls keiner vorhanden ist"""
+        key = (start_tile, goal_tile, version)
+        path = self.entries.get(key)
+        if path is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return list(path)
+
+        # Teilstück eines gespeicherten Pfades zum selben Ziel
+        on_path = self.by_goal.get((goal_tile, version))
+        if on_path and start_tile in on_path:
+            key, index = on_path[start_tile]
+            self.entries.move_to_end(key)
+            self.suffix_hits += 1
+            return self.entries[key][index:]
+
+        self.misses += 1
+        return None
+
+    def put(self, start_tile, goal_tile, version, path):
+        """Speichert einen Pfad und verdrängt bei Bedarf den ältesten Eintrag"""
+        if self.size <= 0 or not path:
+            return
+
+        key = (start_tile, goal_tile, version)
+        self.entries[key] = list(path)
+        self.entries.move_to_end(key)
+
+        on_path = self.by_goal.setdefault((goal_tile, version), {})
+        for index, (px, py) in enumerate(path):
+            on_path[(int(px // TILESIZE), int(py // TILESIZE))] = (key, index)
+
+        while len(self.entries) > self.size:
+            self.evict(*self.entries.popitem(last=False))
+
+    def evict(self, key, path):
+        """Entfernt die Teilpfad-Einträge eines verdrängten Pfades"""
+        _, goal_tile, version = key
+        on_path = self.by_goal.get((goal_tile, version))
+        if on_path is None:
+            return
+        for px, py in path:
+            tile = (int(px // TILESIZE), int(py // TILESIZE))
+            if tile in on_path and on_path[tile][0] == key:
+                del on_path[tile]
+        if not on_path:
+            del self.by_goal[(goal_tile, version)]
+
+    def invalidate_tiles(self, tiles):
+        """Entfernt alle Pfade, die über eines der Tiles führen (z.B. nach einer neuen Wand)"""
+        tiles = set(tiles)
+        stale = [key for key, path in self.entries.items()
+                 if any((int(px // TILESIZE), int(py // TILESIZE)) in tiles for px, py in path)]
+        for key in stale:
+            self.evict(key, self.entries.pop(key))
+
+    def clear(self):
+        """Leert den Cache (Statistik bleibt erhalten)"""
+        self.entries.clear()
+        self.by_goal.clear()
+
+    def stats(self):
+        """Gibt die Trefferstatistik des Caches zurück"""
+        lookups = self.hits + self.suffix_hits + self.misses
+        return {
+            'size': len(self.entries),
+            'hits': self.hits,
+            'suffix_hits': self.suffix_hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits + self.suffix_hits) / lookups if lookups else 0.0,
+        }
 
 
 class PathFinder:
-    """Einfache A* Implementation für das Zombie-Pathfinding"""
+    """A* Implementation für das Zombie-Pathfinding.
 
-    def __init__(self, game):
+    Der Suchzustand liegt in flachen Arrays (Index = y * width + x), die über
+    alle Aufrufe wiederverwendet werden. Statt sie bei jeder Suche neu
+    anzulegen, markiert ein Generationszähler, welche Einträge gültig sind.
+    Die Wände liest der PathFinder direkt aus dem TileGrid der Karte.
+    """
+
+    def __init__(self, game, max_nodes=None, cache_size=None, walls=None):
         self.game = game
-        self.walls = [[0 for _ in range(GRIDWIDTH)] for _ in range(GRIDHEIGHT)]
-        self.update_walls()
+        # Maximal expandierte Knoten pro Suche (PATHFINDING_MAX_NODES = None: unbegrenzt)
+        self.max_nodes = PATHFINDING_MAX_NODES if max_nodes is None else max_nodes
+
+        # Wand-Version (jede Änderung) und Cache-Version (nur beim kompletten Neuaufbau);
+        # nach einzelnen Tile-Änderungen werden nur betroffene Pfade aus dem Cache entfernt
+        self.version = 0
+        self.cache_version = 0
+        self.cache = PathCache(cache_size)
+
+        if walls is not None:
+            # Ohne Spiel, z.B. in einem Worker-Prozess aus einem Snapshot
+            self.set_walls(walls)
+        else:
+            self.update_walls()
 
     def update_walls(self):
-        """Aktualisiert die Wandmatrix aus den aktuellen Wand-Sprites"""
-        # Reset walls grid
-        self.walls = [[0 for _ in range(GRIDWIDTH)] for _ in range(GRIDHEIGHT)]
-        # Set walls from map
-        for wall in self.game.walls:
-            self.walls[wall.y][wall.x] = 1
-
-    def find_path(self, start, end):
+        """Übernimmt das Tile-Gitter der Karte (gemeinsamer Puffer, keine Kopie)"""
+        self.set_walls(self.game.map.map_data)
+
+    def set_walls(self, walls):
+        """Übernimmt ein TileGrid oder eine Wandmatrix (Liste von Zeilen) und setzt den Suchzustand zurück"""
+        self.walls = walls if isinstance(walls, TileGrid) else TileGrid.from_rows(walls)
+        self.width = self.walls.width
+        self.height = self.walls.height
+
+        # Suchzustand in flachen, kompakten Arrays (Index = y * width + x)
+        size = self.width * self.height
+        self.g_score = array('d', bytes(8 * size))
+        self.came_from = array('i', [-1]) * size
+        self.seen = array('I', [0]) * size  # Generation, in der g_score/came_from gesetzt wurden
+        self.closed = array('I', [0]) * size  # Generation, in der der Knoten abgeschlossen wurde
+        self.generation = 0
+
+        # Nachbarn pro Tile als Liste von (Index, Kosten), erst bei Bedarf berechnet
+        self.neighbors = {}
+
+        # Alte Cache-Einträge gehören zu einer veralteten Wand-Version
+        self.version += 1
+        self.cache_version += 1
+        self.cache.clear()
+
+    def set_tile(self, x, y, value):
+        """Ändert ein einzelnes Tile und aktualisiert nur die betroffenen Nachbartabellen.
+
+        Für eigene Wandmatrizen (z.B. den Snapshot im Worker). Das Tile-Gitter der
+        Karte ändert Map.set_tile, der PathFinder folgt dann über on_tile_changed.
+        """
+        if self.walls[y][x] == value:
+            return
+        self.walls[y][x] = value
+        self.on_tile_changed(x, y, value)
+
+    def on_tile_changed(self, x, y, value):
+        """Zieht eine Änderung am Tile-Gitter nach (auch Listener von Map.set_tile, Gitter bereits geändert)"""
+        # Das Tile selbst und seine 8 Nachbarn (wegen der Diagonalregel) werden bei Bedarf neu berechnet
+        for ny in range(y - 1, y + 2):
+            for nx in range(x - 1, x + 2):
+                self.neighbors.pop(ny * self.width + nx, None)
+
+        self.version += 1
+
+        # Eine neue Wand macht Pfade über das Tile und Diagonalen um seine Ecken ungültig.
+        # Eine entfernte Wand lässt gespeicherte Pfade gültig (höchstens nicht mehr die kürzesten)
+        if value:
+            self.cache.invalidate_tiles((nx, ny) for ny in range(y - 1, y + 2) for nx in range(x - 1, x + 2))
+
+    def tile_neighbors(self, x, y):
+        """Gibt die begehbaren Nachbarn eines Tiles als (Index, Kosten) zurück"""
+        width, height, walls = self.width, self.height, self.walls
+        if walls[y][x]:
+            return []
+
+        result = []
+        for dx, dy, cost in NEIGHBORS:
+            nx, ny = x + dx, y + dy
+
+            # Überprüfe Grenzen und Hindernisse
+            if not (0 <= nx < width and 0 <= ny < height) or walls[ny][nx]:
+                continue
+
+            # Diagonale Bewegung in Wände vermeiden
+            if dx != 0 and dy != 0 and (walls[y][nx] or walls[ny][x]):
+                continue
+
+            result.append((ny * width + nx, cost))
+        return result
+
+    def neighbors_of(self, index):
+        """Nachbarn eines Tiles (Index = y * width + x), berechnet beim ersten Zugriff"""
+        result = self.neighbors.get(index)
+        if result is None:
+            result = self.neighbors[index] = self.tile_neighbors(index % self.width, index // self.width)
+        return result
+
+    def snapshot(self):
+        """Unveränderliche Kopie der Wandmatrix für Worker-Threads oder -Prozesse"""
+        return self.walls.copy()
+
+    def find_path(self, start, end, max_nodes=None):
         """Findet einen Pfad von Start- zu Zielpunkt mit A*"""
+        width = self.width
+
         # Konvertiere Pixel-Koordinaten zu Grid-Koordinaten
         start_x, start_y = int(start[0] // TILESIZE), int(start[1] // TILESIZE)
         end_x, end_y = int(end[0] // TILESIZE), int(end[1] // TILESIZE)
 
         # Stellen Sie sicher, dass Start und Ziel innerhalb der Grenzen liegen
-        if not (0 <= start_x < GRIDWIDTH and 0 <= start_y < GRIDHEIGHT and
-                0 <= end_x < GRIDWIDTH and 0 <= end_y < GRIDHEIGHT):
+        if not (0 <= start_x < width and 0 <= start_y < self.height and
+                0 <= end_x < width and 0 <= end_y < self.height):
             return []
 
         # Überprüfen Sie, ob Start oder Ziel in einem Hindernis liegen
         if self.walls[start_y][start_x] or self.walls[end_y][end_x]:
             return []
 
-        # Prioritätswarteschlange für offene Knoten (f_cost, position)
-        open_set = []
-        heapq.heappush(open_set, (0, (start_x, start_y)))
+        start_tile = (start_x, start_y)
+        end_tile = (end_x, end_y)
+        path = self.cache.get(start_tile, end_tile, self.cache_version)
+        if path is None:
+            path = self.search(start_tile, end_tile, max_nodes)
+            self.cache.put(start_tile, end_tile, self.cache_version, path)
+        return path
+
+    def search(self, start_tile, end_tile, max_nodes=None):
+        """A*-Suche zwischen zwei freien Tiles, gibt Pixel-Mittelpunkte zurück"""
+        width = self.width
+        start_x, start_y = start_tile
+        end_x, end_y = end_tile
 
-        # Verfolgen, woher jeder Knoten kommt
-        came_from = {}
+        if max_nodes is None:
+            max_nodes = self.max_nodes
 
-        # g_score: Kosten vom Start zu jedem Knoten
-        g_score = {(x, y): float('inf') for x in range(GRIDWIDTH) for y in range(GRIDHEIGHT)}
-        g_score[(start_x, start_y)] = 0
+        # Neue Generation: alle alten Einträge werden damit ungültig
+        self.generation += 1
+        generation = self.generation
+        g_score, came_from, seen, closed = self.g_score, self.came_from, self.seen, self.closed
+        neighbors = self.neighbors
 
-        # f_score: Geschätzte Gesamtkosten (g_score + Heuristik)
-        f_score = {(x, y): float('inf') for x in range(GRIDWIDTH) for y in range(GRIDHEIGHT)}
-        f_score[(start_x, start_y)] = self.heuristic((start_x, start_y), (end_x, end_y))
+        start_index = start_y * width + start_x
+        end_index = end_y * width + end_x
+        g_score[start_index] = 0.0
+        came_from[start_index] = -1
+        seen[start_index] = generation
 
-        # Set für besuchte Knoten
-        closed_set = set()
+        # Prioritätswarteschlange für offene Knoten (f_cost, index)
+        open_set = [(self.octile(start_x, start_y, end_x, end_y), start_index)]
+        expanded = 0
 
         while open_set:
             # Knoten mit niedrigstem f_score
             _, current = heapq.heappop(open_set)
 
-            if current in closed_set:
+            if closed[current] == generation:
                 continue
 
             # Ziel erreicht
-            if current == (end_x, end_y):
-                path = self.reconstruct_path(came_from, current)
-                return [(p[0] * TILESIZE + TILESIZE // 2, p[1] * TILESIZE + TILESIZE // 2) for p in path]
-
-            closed_set.add(current)
-
-            # Prüfe alle Nachbarn
-            for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0), (1, 1), (-1, 1), (1, -1), (-1, -1)]:
-                neighbor = (current[0] + dx, current[1] + dy)
-
-                # Überprüfe Grenzen
-                if not (0 <= neighbor[0] < GRIDWIDTH and 0 <= neighbor[1] < GRIDHEIGHT):
-                    continue
+            if current == end_index:
+                path = self.reconstruct_path(current)
+                return [((i % width) * TILESIZE + TILESIZE // 2, (i // width) * TILESIZE + TILESIZE // 2)
+                        for i in path]
 
-                # Überprüfe Hindernisse
-                if self.walls[neighbor[1]][neighbor[0]]:
-                    continue
+            closed[current] = generation
 
-                # Diagonale Bewegung in Wände vermeiden
-                if dx != 0 and dy != 0:  # Diagonaler Schritt
-                    if self.walls[current[1]][neighbor[0]] or self.walls[neighbor[1]][current[0]]:
-                        continue
+            # Knotenbudget, damit eine einzelne Suche keinen Frame blockiert
+            expanded += 1
+            if max_nodes is not None and expanded > max_nodes:
+                return []
 
-                # Berechne g_score für Nachbarn
-                # Diagonale Bewegung kostet √2 ≈ 1.414
-                move_cost = 1.414 if dx != 0 and dy != 0 else 1
-                tentative_g_score = g_score[current] + move_cost
+            current_g = g_score[current]
+            current_neighbors = neighbors.get(current)
+            if current_neighbors is None:
+                current_neighbors = neighbors[current] = self.tile_neighbors(current % width, current // width)
+            for neighbor, move_cost in current_neighbors:
+                tentative_g_score = current_g + move_cost
 
-                if tentative_g_score < g_score[neighbor]:
+                if seen[neighbor] != generation or tentative_g_score < g_score[neighbor]:
                     # Dies ist ein besserer Weg
+                    seen[neighbor] = generation
                     came_from[neighbor] = current
                     g_score[neighbor] = tentative_g_score
-                    f_score[neighbor] = tentative_g_score + self.heuristic(neighbor, (end_x, end_y))
-                    heapq.heappush(open_set, (f_score[neighbor], neighbor))
+                    nx, ny = neighbor % width, neighbor // width
+                    f_score = tentative_g_score + self.octile(nx, ny, end_x, end_y)
+                    heapq.heappush(open_set, (f_score, neighbor))
 
         # Kein Pfad gefunden
         return []
 
-    def heuristic(self, a, b):
-        """Schätzt die Kosten von a nach b mit der Manhattan-Distanz"""
-        return abs(a[0] - b[0]) + abs(a[1] - b[1])
+    @staticmethod
+    def octile(x1, y1, x2, y2):
+        """Oktil-Distanz: zulässige Heuristik für 8 Richtungen mit Diagonalkosten 1.414"""
+        dx = abs(x1 - x2)
+        dy = abs(y1 - y2)
+        return dx + dy - 0.586 * min(dx, dy)
 
-    def reconstruct_path(self, came_from, current):
-        """Rekonstruiert den Pfad von Start zu Ziel"""
+    def reconstruct_path(self, current):
+        """Rekonstruiert den Pfad (als Tile-Indizes) von Start zu Ziel"""
+        came_from = self.came_from
         path = [current]
-        while current in came_from:
+        while came_from[current] != -1:
             current = came_from[current]
             path.append(current)
-        return path[::-1]  # Umkehren, um vom Start zum Ziel zu gehen
\ No newline at end of file
+        return path[::-1]  # Umkehren, um vom Start zum Ziel zu gehen
@@ -0,0 +1,85 @@
+from settings import *
+
+
+class SpatialHash:
+    """Gleichmäßiges Gitter (Broad Phase) für schnelle Kollisionsabfragen zwischen Sprites"""
+
+    def __init__(self, cell_size=None):
+        self.cell_size = SPATIAL_HASH_CELL_SIZE if cell_size is None else cell_size
+        # (Zelle x, Zelle y) -> (Einfügereihenfolgen, Sprites, Rects)
+        self.cells = {}
+
+    def clear(self):
+        """Leert alle Zellen"""
+        self.cells.clear()
+
+    def cell_range(self, rect):
+        """Gibt die Zellbereiche (x und y) zurück, die das Rect überlappt"""
+        cs = self.cell_size
+        return (range(rect.left // cs, (rect.right - 1) // cs + 1),
+                range(rect.top // cs, (rect.bottom - 1) // cs + 1))
+
+    def insert(self, sprite, order):
+        """Trägt ein Sprite in alle Zellen ein, die sein Rect überlappt"""
+        cells = self.cells
+        rect = sprite.rect
+        cols, rows = self.cell_range(rect)
+        for cy in rows:
+            for cx in cols:
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = ([order], [sprite], [rect])
+                else:
+                    bucket[0].append(order)
+                    bucket[1].append(sprite)
+                    bucket[2].append(rect)
+
+    def rebuild(self, sprites):
+        """Baut das Gitter aus einer Sprite-Gruppe neu auf (einmal pro Tick)"""
+        self.cells.clear()
+        for order, sprite in enumerate(sprites):
+            self.insert(sprite, order)
+
+    def query(self, rect):
+        """Gibt alle lebenden Sprites zurück, deren Rect das Rect schneidet.
+
+        Die Reihenfolge entspricht der Reihenfolge der Gruppe beim Aufbau,
+        damit die Ergebnisse identisch zu pg.sprite.spritecollide sind.
+        """
+        cells = self.cells
+        cols, rows = self.cell_range(rect)
+        found = {}
+        for cy in rows:
+            for cx in cols:
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    orders, sprites, rects = bucket
+                    # Feinprüfung der Rects einer Zelle in einem Aufruf
+                    for i in rect.collidelistall(rects):
+                        sprite = sprites[i]
+                        if sprite.alive():
+                            found[orders[i]] = sprite
+        if len(found) < 2:
+            return list(found.values())
+        return [found[order] for order in sorted(found)]
+
+
+def spritecollide(sprite, spatial_hash, dokill):
+    """Wie pg.sprite.spritecollide, aber über einen SpatialHash"""
+    hits = spatial_hash.query(sprite.rect)
+    if dokill:
+        for hit in hits:
+            hit.kill()
+    return hits
+
+
+def groupcollide(groupa, spatial_hash_b, dokilla, dokillb):
+    """Wie pg.sprite.groupcollide, wobei die zweite Gruppe als SpatialHash vorliegt"""
+    crashed = {}
+    for sprite in groupa.sprites():
+        hits = spritecollide(sprite, spatial_hash_b, dokillb)
+        if hits:
+            crashed[sprite] = hits
+            if dokilla:
+                sprite.kill()
+    return crashed